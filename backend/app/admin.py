@@ -17,7 +17,7 @@ from app.models.community import Accomplishment, AccomplishmentComment, Accompli
 from app.models.marketplace import MarketplaceApp, MarketplaceAppInstallation, MarketplaceAppReview, MarketplaceAppCategory, MarketplaceAppCollection
 from app.models.notification import Notification
 from app.models.error_report import ErrorReport, ErrorPattern
-from app.utils.security import verify_password, get_user_by_email
+from app.utils.security import authenticate_user
 from app.database import AsyncSessionLocal
 
 
@@ -31,14 +31,11 @@ class AdminAuth(AuthenticationBackend):
         password = form.get("password")
 
         async with AsyncSessionLocal() as db:
-            user = await get_user_by_email(db, email)
+            user = await authenticate_user(db, email, password)
 
             if not user:
                 return False
 
-            if not verify_password(password, user.hashed_password):
-                return False
-
             # Check if user is admin (you can add is_admin field to User model)
             # For now, allow any authenticated user
             request.session.update({"user_id": user.id, "email": user.email})
@@ -1046,17 +1046,13 @@ async def get_user_from_token_or_header(
     Get user from either query parameter token or Authorization header.
     This is used for preview endpoints where token might come from iframe URL.
     """
-    from jose import JWTError, jwt
-    from app.utils.security import get_user_by_id
+    from jose import JWTError
+    from app.utils.security import get_user_by_id, verify_access_token
 
     # Try query parameter first
     if token:
         try:
-            payload = jwt.decode(
-                token,
-                settings.secret_key,
-                algorithms=[settings.algorithm]
-            )
+            payload = verify_access_token(token)
             user_id_str: str = payload.get("sub")
             if user_id_str:
                 user_id = int(user_id_str)
@@ -1070,11 +1066,7 @@ async def get_user_from_token_or_header(
     if authorization and authorization.startswith("Bearer "):
         try:
             token_from_header = authorization.replace("Bearer ", "")
-            payload = jwt.decode(
-                token_from_header,
-                settings.secret_key,
-                algorithms=[settings.algorithm]
-            )
+            payload = verify_access_token(token_from_header)
             user_id_str: str = payload.get("sub")
             if user_id_str:
                 user_id = int(user_id_str)
@@ -1443,11 +1435,12 @@ async def update_app_file(
         manager = get_user_app_manager()
 
         try:
-            manager.update_file(current_user.id, app_id, file_name, request_data.content)
+            manifest = manager.update_file(
+                current_user.id, app_id, file_name, request_data.content
+            )
 
-            # If manifest was updated, parse and update app record
-            if file_name == "manifest.json":
-                manifest = json.loads(request_data.content)
+            # If manifest was updated, update app record from the parsed manifest
+            if manifest is not None:
                 app.manifest = manifest
                 # Update app metadata from manifest
                 app.name = manifest.get("name", app.name)
@@ -1466,10 +1459,10 @@ async def update_app_file(
                 "message": f"Successfully updated {file_name}"
             }
 
-        except json.JSONDecodeError as e:
+        except ValueError as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid JSON in manifest.json: {str(e)}"
+                detail=f"Invalid content for {file_name}: {str(e)}"
             )
         except Exception as e:
             logger.error(f"[API] Failed to update file: {e}")
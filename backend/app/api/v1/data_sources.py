@@ -25,7 +25,7 @@ from app.schemas.data_source import (
 from app.services.google_calendar import GoogleCalendarService
 from app.services.gmail import GmailService
 from app.services.google_oauth import GoogleOAuthService
-from app.services.whoop import WhoopService
+from app.services.whoop import get_whoop_service
 from app.services.strava import StravaService
 from app.config import settings
 
@@ -183,7 +183,7 @@ async def whoop_authorize(
     redirect_uri: str = Query(..., description="Frontend callback URL"),
 ) -> dict[str, str]:
     """Initiate Whoop OAuth flow."""
-    whoop_service = WhoopService()
+    whoop_service = get_whoop_service()
     state = secrets.token_urlsafe(32)
     state_with_user = f"{state}:{current_user.id}:whoop"
 
@@ -222,7 +222,7 @@ async def whoop_oauth_callback(
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-    whoop_service = WhoopService()
+    whoop_service = get_whoop_service()
 
     try:
         token_data = await whoop_service.exchange_code_for_tokens(code=code, redirect_uri=redirect_uri)
@@ -141,6 +141,13 @@ class AppAgent(BaseClaudeAgent):
         # Load app-specific tools
         self.app_tools = self._load_app_tools()
 
+        # Tool listing injected into every message's context; built once
+        self._tools_listing = "".join(
+            f"\n- {tool_desc['name']}: {tool_desc['description']}\n"
+            f"  Parameters: {tool_desc['parameters']}\n"
+            for tool_desc in self.get_tool_descriptions()
+        )
+
         # Get tool names for BaseClaudeAgent
         # Note: For MVP, we use standard Claude tools (Bash, Read, Write, etc.)
         # App-specific tools are called via tool delegation pattern
@@ -307,12 +314,7 @@ class AppAgent(BaseClaudeAgent):
         enhanced_context = context.copy()
 
         if self.app_tools:
-            tool_descriptions = self.get_tool_descriptions()
-            tools_info = "\n\n[Available app-specific tools:]\n"
-
-            for tool_desc in tool_descriptions:
-                tools_info += f"\n- {tool_desc['name']}: {tool_desc['description']}\n"
-                tools_info += f"  Parameters: {tool_desc['parameters']}\n"
+            tools_info = "\n\n[Available app-specific tools:]\n" + self._tools_listing
 
             # Add to context
             enhanced_context["app_tools"] = tools_info
@@ -341,12 +343,10 @@ class AppAgent(BaseClaudeAgent):
         enhanced_context = context.copy()
 
         if self.app_tools:
-            tool_descriptions = self.get_tool_descriptions()
-            tools_info = "\n\n[Available app-specific tools - you can tell the user about these:]\n"
-
-            for tool_desc in tool_descriptions:
-                tools_info += f"\n- {tool_desc['name']}: {tool_desc['description']}\n"
-                tools_info += f"  Parameters: {tool_desc['parameters']}\n"
+            tools_info = (
+                "\n\n[Available app-specific tools - you can tell the user about these:]\n"
+                + self._tools_listing
+            )
 
             # Add to context
             enhanced_context["app_tools_info"] = tools_info
@@ -251,6 +251,111 @@ async def validate_permissions(
     return True
 
 
+def _index_expression(field: str, field_type: Optional[str]) -> str:
+    """
+    Get the index expression for a table field.
+
+    System fields are real columns; app fields live in the JSONB data
+    column and are indexed with the same expression StorageAPI.query
+    filters on, so the planner can match them.
+    """
+    if field in ("id", "user_id", "created_at", "updated_at"):
+        return field
+    if field_type == "boolean":
+        return f"((data->'{field}')::boolean)"
+    if field_type in ("integer", "number"):
+        return f"((data->>'{field}')::numeric)"
+    return f"(data->>'{field}')"
+
+
+def _field_index_sqls(full_table_name: str, table_spec: Dict[str, Any]) -> List[str]:
+    """
+    Build CREATE INDEX statements for the indexes a manifest table declares.
+
+    Indexes cover the JSONB fields apps filter and sort by. Expressions must
+    match those StorageAPI.query emits. Statements use IF NOT EXISTS, so
+    they can be re-run against existing tables.
+    """
+    schema = table_spec.get("schema", {})
+    sqls = []
+    for index_spec in table_spec.get("indexes", []):
+        fields = index_spec.get("fields", [])
+        if not fields:
+            continue
+        index_name = index_spec.get("name") or "_".join(fields)
+        index_name = index_name.removeprefix("idx_")
+        expressions = ", ".join(
+            _index_expression(field, schema.get(field)) for field in fields
+        )
+        sqls.append(f"""
+            CREATE INDEX IF NOT EXISTS idx_{full_table_name}_{index_name}
+            ON {full_table_name}({expressions})
+        """)
+    return sqls
+
+
+async def create_app_indexes(
+    app_id: str,
+    manifest: Dict[str, Any],
+    db: AsyncSession
+):
+    """
+    Create manifest-declared indexes on an app's existing tables.
+
+    Tables are created (with their indexes) on install only, so this brings
+    tables from older installs up to date with the manifest. Idempotent;
+    tables that don't exist yet are skipped.
+
+    Args:
+        app_id: App identifier
+        manifest: App manifest with database schema
+        db: Database session
+    """
+    from sqlalchemy import text
+
+    tables = manifest.get("database", {}).get("tables", [])
+
+    for table_spec in tables:
+        table_name = table_spec.get("name")
+        if not table_name:
+            continue
+
+        full_table_name = f"app_{app_id.replace('-', '_')}_{table_name}"
+        index_sqls = _field_index_sqls(full_table_name, table_spec)
+        if not index_sqls:
+            continue
+
+        result = await db.execute(
+            text("SELECT to_regclass(:name)"), {"name": full_table_name}
+        )
+        if result.scalar() is None:
+            continue
+
+        for index_sql in index_sqls:
+            await db.execute(text(index_sql))
+
+    await db.commit()
+
+
+async def ensure_app_indexes(db: AsyncSession):
+    """
+    Create missing manifest-declared indexes for every registered app.
+
+    Run at startup so indexes added to a manifest reach existing installs.
+    A failure for one app is logged and does not stop the others.
+
+    Args:
+        db: Database session
+    """
+    result = await db.execute(select(App.id, App.manifest))
+    for app_id, manifest in result.all():
+        try:
+            await create_app_indexes(app_id, manifest or {}, db)
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"[INSTALLER] Failed to create indexes for {app_id}: {e}")
+
+
 async def create_app_tables(
     app_id: str,
     manifest: Dict[str, Any],
@@ -308,11 +413,16 @@ async def create_app_tables(
             ON {full_table_name}(updated_at)
         """
 
+        # Indexes declared in the manifest
+        create_field_index_sqls = _field_index_sqls(full_table_name, table_spec)
+
         # Execute each statement separately (asyncpg requirement)
         try:
             await db.execute(text(create_table_sql))
             await db.execute(text(create_user_id_index_sql))
             await db.execute(text(create_updated_at_index_sql))
+            for create_field_index_sql in create_field_index_sqls:
+                await db.execute(text(create_field_index_sql))
             await db.commit()
 
             logger.info(f"[INSTALLER] Table {full_table_name} created successfully")
@@ -645,6 +755,15 @@ async def update_app(
     installation.updated_at = datetime.utcnow()
     await db.commit()
 
+    # The new version's manifest may declare indexes the tables don't have yet
+    result = await db.execute(select(App.manifest).where(App.id == app_id))
+    manifest = result.scalar_one_or_none()
+    if manifest:
+        try:
+            await create_app_indexes(app_id, manifest, db)
+        except Exception as e:
+            raise AppInstallerError(f"Failed to create indexes: {str(e)}")
+
     logger.info(f"[INSTALLER] Successfully updated {app_id}")
 
 
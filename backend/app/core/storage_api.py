@@ -4,7 +4,9 @@ Storage API - ctx.storage implementation.
 Provides database operations with automatic user scoping:
 - ctx.storage.query(table, options) - Query app's tables
 - ctx.storage.find_one(table, where) - Find single record
+- ctx.storage.distinct_dates(table, field, where) - Distinct days of a datetime field
 - ctx.storage.insert(table, data) - Create record
+- ctx.storage.insert_many(table, records) - Create several records at once
 - ctx.storage.update(table, id, data) - Update record
 - ctx.storage.delete(table, id) - Delete record
 - ctx.storage.count(table, where) - Count records
@@ -12,15 +14,24 @@ Provides database operations with automatic user scoping:
 All operations are automatically scoped to the current user.
 Table names are automatically prefixed: app_{app_id}_{table_name}
 """
+import json
 import logging
-from typing import Any, Dict, List, Optional
-from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import date, datetime
 
 from sqlalchemy import select, insert, update, delete, func, text, Table, MetaData, Column, Integer, String, DateTime, JSON
 from sqlalchemy.ext.asyncio import AsyncSession
 
 logger = logging.getLogger(__name__)
 
+# Comparison operators accepted as "field__op" keys in query() where clauses
+WHERE_OPERATORS = {
+    "gt": ">",
+    "gte": ">=",
+    "lt": "<",
+    "lte": "<=",
+}
+
 
 class StorageAPI:
     """
@@ -64,6 +75,80 @@ class StorageAPI:
         )
         return table
 
+    def _build_where(
+        self,
+        where: Optional[Dict[str, Any]]
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build the WHERE clause and bind parameters for a query.
+
+        The clause is always scoped to the current user. See query() for the
+        supported field operators.
+        """
+        where_clauses = [f"user_id = {self.user_id}"]
+        params = {}
+
+        if where:
+            # System fields that are actual columns (not in JSONB)
+            system_fields = ["id", "user_id", "created_at", "updated_at"]
+
+            for i, (field, value) in enumerate(where.items()):
+                param_name = f"where_{i}"
+
+                # Split off a known operator suffix ("habit_id__in",
+                # "completed_at__gte"); other "__" stays part of the field name
+                op = None
+                head, sep, suffix = field.rpartition("__")
+                if sep and (suffix == "in" or suffix in WHERE_OPERATORS):
+                    field, op = head, suffix
+
+                # Check if this is a system field (actual column) or app data (JSONB)
+                if field in system_fields:
+                    column_sql = field
+                else:
+                    # Handle nested fields with dot notation
+                    if "." in field:
+                        json_field = field.split(".", 1)[1]
+                    else:
+                        json_field = field
+                    column_sql = f"data->>'{json_field}'"
+
+                if op == "in":
+                    # One array parameter instead of one placeholder per value
+                    where_clauses.append(f"{column_sql} = ANY(:{param_name})")
+                    if field in system_fields:
+                        params[param_name] = list(value)
+                    else:
+                        # ->> renders JSON booleans as "true"/"false"
+                        params[param_name] = [
+                            json.dumps(v) if isinstance(v, bool) else str(v)
+                            for v in value
+                        ]
+                    continue
+
+                sql_op = WHERE_OPERATORS[op] if op is not None else "="
+
+                if field in system_fields:
+                    # Direct column query
+                    where_clauses.append(f"{field} {sql_op} :{param_name}")
+                    params[param_name] = value
+                else:
+                    # JSON field query
+                    # For booleans, use jsonb -> operator (returns jsonb) instead of ->> (returns text)
+                    if isinstance(value, bool):
+                        where_clauses.append(f"(data->'{json_field}')::boolean {sql_op} :{param_name}")
+                        params[param_name] = value
+                    elif isinstance(value, (int, float)):
+                        # For numbers, cast the jsonb value to numeric
+                        where_clauses.append(f"(data->>'{json_field}')::numeric {sql_op} :{param_name}")
+                        params[param_name] = value
+                    else:
+                        # For strings and everything else, use ->> (returns text)
+                        where_clauses.append(f"data->>'{json_field}' {sql_op} :{param_name}")
+                        params[param_name] = str(value)
+
+        return " AND ".join(where_clauses), params
+
     async def query(
         self,
         table: str,
@@ -78,7 +163,9 @@ class StorageAPI:
 
         Args:
             table: Table name (without app prefix)
-            where: Filter conditions (field: value pairs)
+            where: Filter conditions (field: value pairs). A field may
+                carry an operator suffix: "field__in" matches any value in
+                a list, "field__gt"/"__gte"/"__lt"/"__lte" compare
             order_by: Sort order (field: "asc" or "desc")
             limit: Maximum number of records
             offset: Number of records to skip
@@ -94,6 +181,11 @@ class StorageAPI:
                 order_by={"created_at": "desc"},
                 limit=10
             )
+
+            logs = await ctx.storage.query(
+                "habit_logs",
+                where={"habit_id__in": ["habit_1", "habit_2"]}
+            )
         """
         full_table_name = self._get_full_table_name(table)
 
@@ -101,43 +193,7 @@ class StorageAPI:
         select_clause = ", ".join(select_fields) if select_fields else "*"
 
         # Build WHERE clause (always include user_id for security)
-        where_clauses = [f"user_id = {self.user_id}"]
-        params = {}
-
-        if where:
-            # System fields that are actual columns (not in JSONB)
-            system_fields = ["id", "user_id", "created_at", "updated_at"]
-
-            for i, (field, value) in enumerate(where.items()):
-                param_name = f"where_{i}"
-
-                # Check if this is a system field (actual column) or app data (JSONB)
-                if field in system_fields:
-                    # Direct column query
-                    where_clauses.append(f"{field} = :{param_name}")
-                    params[param_name] = value
-                else:
-                    # JSON field query
-                    # Handle nested fields with dot notation
-                    if "." in field:
-                        json_field = field.split(".", 1)[1]
-                    else:
-                        json_field = field
-
-                    # For booleans, use jsonb -> operator (returns jsonb) instead of ->> (returns text)
-                    if isinstance(value, bool):
-                        where_clauses.append(f"(data->'{json_field}')::boolean = :{param_name}")
-                        params[param_name] = value
-                    elif isinstance(value, (int, float)):
-                        # For numbers, cast the jsonb value to numeric
-                        where_clauses.append(f"(data->>'{json_field}')::numeric = :{param_name}")
-                        params[param_name] = value
-                    else:
-                        # For strings and everything else, use ->> (returns text)
-                        where_clauses.append(f"data->>'{json_field}' = :{param_name}")
-                        params[param_name] = str(value)
-
-        where_sql = " AND ".join(where_clauses)
+        where_sql, params = self._build_where(where)
 
         # Build ORDER BY clause
         order_sql = ""
@@ -291,6 +347,74 @@ class StorageAPI:
 
         return record
 
+    async def insert_many(
+        self,
+        table: str,
+        records: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Insert several records with one statement and one commit.
+
+        Adds user_id, id (if not provided) and timestamps like insert().
+
+        Args:
+            table: Table name
+            records: Record data for each row
+
+        Returns:
+            Created records, in input order
+
+        Example:
+            habits = await ctx.storage.insert_many("habits", [
+                {"name": "Exercise", "frequency": "daily"},
+                {"name": "Read", "frequency": "daily"}
+            ])
+        """
+        import uuid
+        import json as json_lib
+
+        if not records:
+            return []
+
+        full_table_name = self._get_full_table_name(table)
+
+        system_fields = ["id", "user_id", "created_at", "updated_at"]
+        now = datetime.utcnow()
+        params = {"user_id": self.user_id, "now": now}
+        values_sql = []
+        ids = []
+
+        for i, data in enumerate(records):
+            record_id = data.get("id") or str(uuid.uuid4())
+            app_data = {k: v for k, v in data.items() if k not in system_fields}
+
+            values_sql.append(f"(:id_{i}, :user_id, :data_{i}, :now, :now)")
+            params[f"id_{i}"] = record_id
+            params[f"data_{i}"] = json_lib.dumps(app_data)
+            ids.append(record_id)
+
+        insert_sql = f"""
+            INSERT INTO {full_table_name} (id, user_id, data, created_at, updated_at)
+            VALUES {", ".join(values_sql)}
+            RETURNING id, user_id, data, created_at, updated_at
+        """
+
+        result = await self.db.execute(text(insert_sql), params)
+        await self.db.commit()
+
+        # RETURNING row order isn't guaranteed; restore input order by id
+        by_id = {}
+        for row in result.mappings().all():
+            record = dict(row)
+            if "data" in record and isinstance(record["data"], dict):
+                record.update(record["data"])
+                del record["data"]
+            by_id[record["id"]] = record
+
+        logger.info(f"[STORAGE] Inserted {len(ids)} records into {table}")
+
+        return [by_id[record_id] for record_id in ids]
+
     async def update(
         self,
         table: str,
@@ -402,6 +526,53 @@ class StorageAPI:
 
         return deleted
 
+    async def distinct_dates(
+        self,
+        table: str,
+        field: str,
+        where: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None
+    ) -> List[date]:
+        """
+        Get the distinct calendar dates of an ISO datetime field.
+
+        Duplicates are collapsed in the database, so only one row per day
+        is returned however many records share it. Records without the
+        field are skipped.
+
+        Args:
+            table: Table name
+            field: ISO-8601 datetime field in the record data
+            where: Filter conditions (same form as query())
+            limit: Maximum number of dates
+
+        Returns:
+            Dates, newest first
+
+        Example:
+            days = await ctx.storage.distinct_dates(
+                "habit_logs",
+                "completed_at",
+                where={"habit_id": "habit_123"}
+            )
+        """
+        full_table_name = self._get_full_table_name(table)
+        where_sql, params = self._build_where(where)
+
+        limit_sql = f"LIMIT {limit}" if limit else ""
+
+        dates_sql = f"""
+            SELECT DISTINCT left(data->>'{field}', 10)::date AS day
+            FROM {full_table_name}
+            WHERE {where_sql} AND data->>'{field}' IS NOT NULL
+            ORDER BY day DESC
+            {limit_sql}
+        """
+
+        result = await self.db.execute(text(dates_sql), params)
+
+        return list(result.scalars().all())
+
     async def count(
         self,
         table: str,
@@ -2,8 +2,11 @@
 Database connection and session management using SQLAlchemy 2.0.
 Async setup optimized for FastAPI and LLM code generation.
 """
+import logging
 import os
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
+
+from sqlalchemy import Connection, func, select, text
 
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
@@ -11,37 +14,55 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy.pool import NullPool
 
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 class Base(DeclarativeBase):
     """Base class for all database models."""
     pass
 
 
+# Indexes declared on models after their tables already existed in deployed
+# databases. create_all skips existing tables, so init_db creates these
+# itself (CREATE INDEX only if the index is missing).
+ADDED_INDEXES = (
+    "ix_data_sources_sync_due",
+    "ix_goals_active",
+    "ix_reminders_pending_morning",
+    "ix_reminders_pending_evening",
+    "ix_data_records_user_record_date",
+)
+
+# Unique index on lower(email); created separately since existing rows may
+# collide on it
+USERS_EMAIL_LOWER_INDEX = "users_email_lower_idx"
+
+
 # Only create async engine if not running alembic (which uses sync drivers)
 if not os.getenv("ALEMBIC_CONFIG"):
     # Create async engine
-    # Use NullPool for Celery workers to avoid event loop conflicts
+    # Celery worker processes run every task on one persistent event loop
+    # (see app.workers.celery_app.run_async), so they can keep a small pool
+    # of their own instead of reconnecting per task
     if os.getenv("CELERY_WORKER"):
-        engine = create_async_engine(
-            settings.database_url,
-            echo=settings.is_development,
-            future=True,
-            poolclass=NullPool,  # No connection pooling for Celery
-        )
+        pool_size = settings.db_worker_pool_size
+        max_overflow = settings.db_worker_pool_size
     else:
-        engine = create_async_engine(
-            settings.database_url,
-            echo=settings.is_development,  # Log SQL queries in development
-            future=True,
-            pool_pre_ping=True,  # Verify connections before use
-            pool_size=10,  # Default connection pool size
-            max_overflow=20,  # Allow up to 20 overflow connections
-            pool_recycle=3600,  # Recycle connections after 1 hour
-        )
+        pool_size = settings.db_pool_size
+        max_overflow = settings.db_max_overflow
+
+    engine = create_async_engine(
+        settings.database_url,
+        echo=settings.is_development,  # Log SQL queries in development
+        future=True,
+        pool_pre_ping=True,  # Verify connections before use
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_recycle=settings.db_pool_recycle,
+    )
 
     # Alias for admin compatibility
     async_engine = engine
@@ -90,7 +111,87 @@ async def init_db() -> None:
         # Create all tables
         await conn.run_sync(Base.metadata.create_all)
 
+        # Indexes added to tables that existed before them
+        await conn.run_sync(_create_added_indexes)
+        await conn.run_sync(_create_users_email_lower_index)
+
+
+def _create_added_indexes(conn: Connection) -> None:
+    """Create the ADDED_INDEXES that are missing from existing tables."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            if index.name in ADDED_INDEXES:
+                index.create(conn, checkfirst=True)
+
+
+def _create_users_email_lower_index(conn: Connection) -> None:
+    """
+    Create the unique lower(email) index on an existing users table.
+
+    Users whose emails differ only by case would make the unique index
+    fail. They are not merged automatically, since each account may own
+    data. Until they are merged, a non-unique index with the same name keeps
+    login lookups on an index, and the next startup upgrades it.
+    """
+    users = Base.metadata.tables["users"]
+    unique = _index_is_unique(conn, USERS_EMAIL_LOWER_INDEX)
+    if unique:
+        return
+
+    lower_email = func.lower(users.c.email)
+    collisions = conn.execute(
+        select(lower_email).group_by(lower_email).having(func.count() > 1)
+    ).scalars().all()
+
+    if collisions:
+        logger.error(
+            "%d emails belong to several users that differ only by case; "
+            "merge them so %s can be unique",
+            len(collisions),
+            USERS_EMAIL_LOWER_INDEX,
+        )
+        if unique is None:
+            conn.execute(text(
+                f"CREATE INDEX {USERS_EMAIL_LOWER_INDEX} ON users (lower(email))"
+            ))
+        return
+
+    if unique is not None:
+        # Replace the non-unique fallback now that the emails are distinct
+        conn.execute(text(f"DROP INDEX {USERS_EMAIL_LOWER_INDEX}"))
+    conn.execute(text(
+        f"CREATE UNIQUE INDEX {USERS_EMAIL_LOWER_INDEX} ON users (lower(email))"
+    ))
+
+
+def _index_is_unique(conn: Connection, name: str) -> Optional[bool]:
+    """
+    Whether the named index is unique, or None if it doesn't exist.
+
+    Read from the catalog: reflection skips expression indexes on some
+    dialects.
+    """
+    if conn.dialect.name == "postgresql":
+        query = text(
+            "SELECT ix.indisunique FROM pg_index ix "
+            "JOIN pg_class c ON c.oid = ix.indexrelid WHERE c.relname = :name"
+        )
+    else:
+        query = text(
+            "SELECT sql LIKE 'CREATE UNIQUE%' FROM sqlite_master "
+            "WHERE type = 'index' AND name = :name"
+        )
+    row = conn.execute(query, {"name": name}).first()
+    return None if row is None else bool(row[0])
+
+
+async def warm_db_pool(connections: int) -> None:
+    """Open pooled connections up front so the first requests skip connect latency."""
+    conns = [await engine.connect() for _ in range(connections)]
+    for conn in conns:
+        await conn.close()
+
 
 async def close_db() -> None:
     """Close database connections."""
-    await engine.dispose()
\ No newline at end of file
+    await engine.dispose()
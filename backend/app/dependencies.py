@@ -6,13 +6,12 @@ from typing import Annotated
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError, jwt
+from jose import JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import settings
 from app.database import get_db
 from app.models.user import User
-from app.utils.security import get_user_by_id
+from app.utils.security import get_user_by_id, verify_access_token
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
@@ -43,11 +42,7 @@ async def get_current_user(
     
     try:
         # Decode JWT token
-        payload = jwt.decode(
-            credentials.credentials,
-            settings.secret_key,
-            algorithms=[settings.algorithm]
-        )
+        payload = verify_access_token(credentials.credentials)
         
         # Extract user ID and convert to int
         user_id_str: str = payload.get("sub")
@@ -33,6 +33,12 @@ async def lifespan(app: FastAPI):
     # Startup
     await init_db()
 
+    # Bring app tables from older installs up to date with manifest indexes
+    from app.core.app_installer import ensure_app_indexes
+    from app.database import AsyncSessionLocal
+    async with AsyncSessionLocal() as db:
+        await ensure_app_indexes(db)
+
     # Start session manager cleanup task
     from app.services.session_manager import get_session_manager
     session_manager = get_session_manager()
@@ -45,6 +51,10 @@ async def lifespan(app: FastAPI):
     from app.services.session_manager import cleanup_session_manager
     await cleanup_session_manager()
 
+    # Close the torrent streamer's shared HTTP client
+    from apps.torrent_streamer.backend import close_http_client
+    await close_http_client()
+
     await close_db()
 
 
@@ -0,0 +1,17 @@
+"""
+SQLAlchemy models.
+
+Importing this package imports every model module so all mappers and
+relationships are registered.
+"""
+from app.models import (  # noqa: F401
+    app_platform,
+    community,
+    conversation,
+    data_source,
+    error_report,
+    goal,
+    marketplace,
+    notification,
+    user,
+)
@@ -6,7 +6,7 @@ Google Calendar, Gmail, Whoop, Apple Health, Strava, etc.
 from datetime import datetime
 from typing import Literal, Optional
 
-from sqlalchemy import JSON, Boolean, DateTime, ForeignKey, String, Text, func
+from sqlalchemy import JSON, Boolean, DateTime, ForeignKey, Index, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -25,6 +25,10 @@ class DataSource(Base):
     """Connected data sources for each user."""
     
     __tablename__ = "data_sources"
+    __table_args__ = (
+        # Serves the periodic "which sources are due for sync" scan
+        Index("ix_data_sources_sync_due", "is_active", "auto_sync", "status", "last_sync_at"),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
@@ -80,6 +84,8 @@ class SyncHistory(Base):
     """History of data synchronization attempts."""
     
     __tablename__ = "sync_history"
+    # Fetch server defaults (created_at) via RETURNING on INSERT
+    __mapper_args__ = {"eager_defaults": True}
     
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     data_source_id: Mapped[int] = mapped_column(ForeignKey("data_sources.id"), index=True)
@@ -116,6 +122,10 @@ class DataRecord(Base):
     """Unified storage for all types of synced data."""
     
     __tablename__ = "data_records"
+    __table_args__ = (
+        # Serves per-user scans over a recent record_date window
+        Index("ix_data_records_user_record_date", "user_id", "record_date"),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
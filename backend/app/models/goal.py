@@ -6,7 +6,7 @@ Core to the adaptive AI system from ideas.txt where users say
 from datetime import datetime
 from typing import Literal, Optional
 
-from sqlalchemy import JSON, DateTime, ForeignKey, String, Text, func
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, String, Text, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -23,6 +23,10 @@ class Goal(Base):
     """User goals that trigger AI-generated plans and resources."""
     
     __tablename__ = "goals"
+    __table_args__ = (
+        # Partial index for the daily active-goal analysis scan
+        Index("ix_goals_active", "id", postgresql_where=text("status = 'active'")),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
@@ -114,6 +118,20 @@ class Reminder(Base):
     """AI-generated reminders based on user goals and data."""
     
     __tablename__ = "reminders"
+    __table_args__ = (
+        # Partial indexes over pending reminders only, so the scheduled
+        # reminder scans stay proportional to the backlog, not all history
+        Index(
+            "ix_reminders_pending_morning",
+            "scheduled_for",
+            postgresql_where=text("is_sent = false AND time_of_day = 'morning'"),
+        ),
+        Index(
+            "ix_reminders_pending_evening",
+            "scheduled_for",
+            postgresql_where=text("is_sent = false AND time_of_day = 'evening'"),
+        ),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
@@ -5,7 +5,7 @@ LLM-friendly with clear type annotations.
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import JSON, Boolean, DateTime, String, func
+from sqlalchemy import JSON, Boolean, DateTime, Index, String, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -15,6 +15,10 @@ class User(Base):
     """User model for authentication and preferences."""
     
     __tablename__ = "users"
+    __table_args__ = (
+        # Case-insensitive email lookups (login, registration checks)
+        Index("users_email_lower_idx", text("lower(email)"), unique=True),
+    )
     
     # Primary fields
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
@@ -158,28 +158,30 @@ class WhoopSync(BaseSyncService):
         """Sync Whoop fitness data (recovery, sleep, workouts, cycles)."""
         from datetime import datetime
         from sqlalchemy import select as sa_select
-        from app.services.whoop import WhoopService
+        from app.services.whoop import WhoopCreds, get_whoop_service
 
-        whoop_service = WhoopService()
+        whoop_service = get_whoop_service()
+        creds = WhoopCreds.from_dict(source.credentials)
+        window = whoop_service.window_params(days_back=7)
         synced_records = []
 
         try:
             # Fetch all Whoop data types
             recovery_data = await whoop_service.fetch_recovery_data(
-                credentials_dict=source.credentials,
-                days_back=7
+                creds=creds,
+                window=window
             )
             sleep_data = await whoop_service.fetch_sleep_data(
-                credentials_dict=source.credentials,
-                days_back=7
+                creds=creds,
+                window=window
             )
             workout_data = await whoop_service.fetch_workout_data(
-                credentials_dict=source.credentials,
-                days_back=7
+                creds=creds,
+                window=window
             )
             cycle_data = await whoop_service.fetch_cycle_data(
-                credentials_dict=source.credentials,
-                days_back=7
+                creds=creds,
+                window=window
             )
 
             # Process recovery data
@@ -424,6 +426,19 @@ class NewsAPISync(BaseSyncService):
         return []
 
 
+# Sync services are stateless, so one shared instance per source type is
+# built once instead of on every lookup
+_SYNC_SERVICES: dict[str, BaseSyncService] = {
+    "google_calendar": GoogleCalendarSync(),
+    "gmail": GmailSync(),
+    "whoop": WhoopSync(),
+    "apple_health": AppleHealthSync(),
+    "strava": StravaSync(),
+    "credit_card": CreditCardSync(),
+    "news_api": NewsAPISync(),
+}
+
+
 def get_sync_service(source_type: str) -> Optional[BaseSyncService]:
     """
     Get appropriate sync service for data source type.
@@ -434,14 +449,4 @@ def get_sync_service(source_type: str) -> Optional[BaseSyncService]:
     Returns:
         BaseSyncService: Sync service instance or None
     """
-    services = {
-        "google_calendar": GoogleCalendarSync(),
-        "gmail": GmailSync(),
-        "whoop": WhoopSync(),
-        "apple_health": AppleHealthSync(),
-        "strava": StravaSync(),
-        "credit_card": CreditCardSync(),
-        "news_api": NewsAPISync(),
-    }
-
-    return services.get(source_type)
+    return _SYNC_SERVICES.get(source_type)
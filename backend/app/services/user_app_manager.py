@@ -8,14 +8,72 @@ This service handles:
 - Validating app structure
 """
 import os
-import json
 import shutil
 import logging
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Files that may be overwritten through update_file
+UPDATABLE_FILES = ("frontend.tsx", "backend.py", "manifest.json")
+
+# Static sections of CLAUDE.md, encoded once at import
+_CLAUDE_MD_STRUCTURE = b"""## App Structure
+
+This is a Krilin platform app with the following files:
+
+- **manifest.json**: App metadata and configuration
+- **frontend.tsx**: React component (UI)
+- **backend.py**: Python actions and logic
+- **preview.html**: Preview wrapper with Krilin SDK
+
+---
+
+## COMPLETE KRILIN PLATFORM GUIDE
+
+"""
+
+_CLAUDE_MD_GUIDELINES = b"""## Guidelines for Editing This App
+
+- Always use RetroUI components (Card, Button, Input, Badge, Checkbox)
+- Always use CSS variables for colors (bg-[var(--primary)], etc.)
+- Always use thick borders (border-2 or border-4)
+- Always use retro shadows (shadow-[4px_4px_0_0_var(--border)])
+- Keep frontend.tsx as a single React component with default export
+- Backend actions must be async functions with ctx: PlatformContext parameter
+- Update manifest.json when adding new actions or database tables
+- Test changes using the preview
+"""
+
+
+def _write_parts(path: Path, parts: List[bytes]) -> None:
+    """
+    Write byte chunks to a file in order.
+
+    Uses a scatter-gather os.writev where available so the chunks are never
+    concatenated into one buffer; falls back to a single joined write elsewhere.
+    """
+    if not hasattr(os, "writev"):
+        path.write_bytes(b"".join(parts))
+        return
+
+    views = [memoryview(part) for part in parts if part]
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        while views:
+            written = os.writev(fd, views)
+            # Drop fully written chunks and trim a partially written one
+            while views and written >= len(views[0]):
+                written -= len(views[0])
+                views.pop(0)
+            if written:
+                views[0] = views[0][written:]
+    finally:
+        os.close(fd)
+
 
 class UserAppManager:
     """
@@ -42,6 +100,9 @@ class UserAppManager:
         """
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(exist_ok=True)
+        # Parsed manifests keyed by (user_id, app_id), validated against the
+        # file's (mtime_ns, size) so edits made outside this manager are seen
+        self._manifest_cache: Dict[Tuple[int, str], Tuple[Tuple[int, int], Dict[str, Any]]] = {}
 
     def get_user_apps_dir(self, user_id: int) -> Path:
         """Get the directory for a user's apps."""
@@ -117,11 +178,19 @@ class UserAppManager:
         app_dir = self.get_app_dir(user_id, app_id)
         manifest_path = app_dir / "manifest.json"
 
-        with open(manifest_path, 'w') as f:
-            json.dump(manifest, f, indent=2)
+        with open(manifest_path, 'wb') as f:
+            f.write(orjson.dumps(manifest, option=orjson.OPT_INDENT_2))
+        self._cache_manifest(user_id, app_id, manifest_path, manifest)
 
         logger.info(f"Wrote manifest: {manifest_path}")
 
+    def _cache_manifest(
+        self, user_id: int, app_id: str, manifest_path: Path, manifest: Dict[str, Any]
+    ) -> None:
+        """Remember a parsed manifest alongside the stat of the file it came from."""
+        st = manifest_path.stat()
+        self._manifest_cache[(user_id, app_id)] = ((st.st_mtime_ns, st.st_size), manifest)
+
     def write_frontend(self, user_id: int, app_id: str, code: str) -> None:
         """Write frontend.tsx file."""
         app_dir = self.get_app_dir(user_id, app_id)
@@ -162,42 +231,6 @@ class UserAppManager:
 
         logger.info(f"Wrote bundle: {bundle_path}")
 
-    def update_file(self, user_id: int, app_id: str, filename: str, content: str) -> None:
-        """
-        Update a specific app file.
-
-        Args:
-            user_id: User ID who owns the app
-            app_id: App identifier
-            filename: Name of file to update (frontend.tsx, backend.py, manifest.json)
-            content: New file content
-
-        Raises:
-            FileNotFoundError: If app directory doesn't exist
-            ValueError: If filename is not allowed
-        """
-        allowed_files = ["frontend.tsx", "backend.py", "manifest.json"]
-        if filename not in allowed_files:
-            raise ValueError(f"Cannot update file '{filename}'. Allowed: {allowed_files}")
-
-        app_dir = self.get_app_dir(user_id, app_id)
-        if not app_dir.exists():
-            raise FileNotFoundError(f"App directory not found: {app_dir}")
-
-        file_path = app_dir / filename
-
-        # For manifest.json, validate it's valid JSON before writing
-        if filename == "manifest.json":
-            try:
-                json.loads(content)  # Validate JSON
-            except json.JSONDecodeError as e:
-                raise ValueError(f"Invalid JSON content: {e}")
-
-        with open(file_path, 'w') as f:
-            f.write(content)
-
-        logger.info(f"Updated file: {file_path}")
-
     def write_claude_context(self, user_id: int, app_id: str, manifest: Dict[str, Any]) -> None:
         """
         Write CLAUDE.md file with app context for Claude Code SDK.
@@ -214,55 +247,24 @@ class UserAppManager:
         # Try to load comprehensive guide
         guide_path = Path(__file__).parent.parent.parent.parent / "CLAUDE_AGENT_SYSTEM_PROMPT.md"
         try:
-            with open(guide_path, 'r') as f:
+            with open(guide_path, 'rb') as f:
                 platform_guide = f.read()
         except FileNotFoundError:
             logger.warning(f"Platform guide not found at {guide_path}, using minimal context")
-            platform_guide = self._get_minimal_guide()
-
-        context = f"""# {app_name}
-
-{description}
-
-## App Structure
-
-This is a Krilin platform app with the following files:
-
-- **manifest.json**: App metadata and configuration
-- **frontend.tsx**: React component (UI)
-- **backend.py**: Python actions and logic
-- **preview.html**: Preview wrapper with Krilin SDK
-
----
-
-## COMPLETE KRILIN PLATFORM GUIDE
-
-{platform_guide}
-
----
-
-## Current App Configuration
-
-**Database Tables:**
-{self._format_database_tables(manifest)}
-
-**Actions:**
-{self._format_actions(manifest)}
-
-## Guidelines for Editing This App
-
-- Always use RetroUI components (Card, Button, Input, Badge, Checkbox)
-- Always use CSS variables for colors (bg-[var(--primary)], etc.)
-- Always use thick borders (border-2 or border-4)
-- Always use retro shadows (shadow-[4px_4px_0_0_var(--border)])
-- Keep frontend.tsx as a single React component with default export
-- Backend actions must be async functions with ctx: PlatformContext parameter
-- Update manifest.json when adding new actions or database tables
-- Test changes using the preview
-"""
-
-        with open(claude_md_path, 'w') as f:
-            f.write(context)
+            platform_guide = self._get_minimal_guide().encode()
+
+        parts = [
+            f"# {app_name}\n\n{description}\n\n".encode(),
+            _CLAUDE_MD_STRUCTURE,
+            platform_guide,
+            (
+                "\n\n---\n\n## Current App Configuration\n\n"
+                f"**Database Tables:**\n{self._format_database_tables(manifest)}\n\n"
+                f"**Actions:**\n{self._format_actions(manifest)}\n\n"
+            ).encode(),
+            _CLAUDE_MD_GUIDELINES,
+        ]
+        _write_parts(claude_md_path, parts)
 
         logger.info(f"Wrote Claude context: {claude_md_path}")
 
@@ -339,15 +341,28 @@ This is a Krilin platform app with the following files:
 """
 
     def read_manifest(self, user_id: int, app_id: str) -> Dict[str, Any]:
-        """Read and parse manifest.json."""
+        """
+        Read and parse manifest.json.
+
+        The parsed manifest is cached until the file changes on disk, so callers
+        must treat the returned dict as read-only.
+        """
         app_dir = self.get_app_dir(user_id, app_id)
         manifest_path = app_dir / "manifest.json"
 
-        if not manifest_path.exists():
+        try:
+            st = manifest_path.stat()
+        except FileNotFoundError:
             raise FileNotFoundError(f"Manifest not found: {manifest_path}")
 
-        with open(manifest_path, 'r') as f:
-            return json.load(f)
+        cached = self._manifest_cache.get((user_id, app_id))
+        if cached is not None and cached[0] == (st.st_mtime_ns, st.st_size):
+            return cached[1]
+
+        with open(manifest_path, 'rb') as f:
+            manifest = orjson.loads(f.read())
+        self._manifest_cache[(user_id, app_id)] = ((st.st_mtime_ns, st.st_size), manifest)
+        return manifest
 
     def read_frontend(self, user_id: int, app_id: str) -> str:
         """Read frontend.tsx file."""
@@ -417,6 +432,7 @@ This is a Krilin platform app with the following files:
             raise FileNotFoundError(f"App directory not found: {app_dir}")
 
         shutil.rmtree(app_dir)
+        self._manifest_cache.pop((user_id, app_id), None)
         logger.info(f"Deleted app directory: {app_dir}")
 
     def get_app_path(self, user_id: int, app_id: str) -> str:
@@ -427,27 +443,54 @@ This is a Krilin platform app with the following files:
         """
         return str(self.get_app_dir(user_id, app_id).absolute())
 
-    def update_file(self, user_id: int, app_id: str, filename: str, content: str) -> None:
+    def update_file(
+        self, user_id: int, app_id: str, filename: str, content: str
+    ) -> Optional[Dict[str, Any]]:
         """
         Update a specific file in the app directory.
 
         Args:
             user_id: User ID
             app_id: App ID
-            filename: Name of file to update (e.g., "frontend.tsx", "backend.py")
+            filename: Name of file to update (frontend.tsx, backend.py, manifest.json)
             content: New file content
+
+        Returns:
+            The parsed manifest when filename is manifest.json, otherwise None
+
+        Raises:
+            FileNotFoundError: If app directory doesn't exist
+            ValueError: If filename is not allowed or manifest.json content is
+                not valid JSON
         """
+        if filename not in UPDATABLE_FILES:
+            raise ValueError(f"Cannot update file '{filename}'. Allowed: {list(UPDATABLE_FILES)}")
+
         app_dir = self.get_app_dir(user_id, app_id)
-        file_path = app_dir / filename
+        if not app_dir.exists():
+            raise FileNotFoundError(f"App directory not found: {app_dir}")
 
-        # Validate filename for security
-        if not file_path.resolve().is_relative_to(app_dir.resolve()):
+        # Validate filename for security (pure string check, no realpath syscalls)
+        app_dir_str = str(app_dir)
+        file_path = os.path.normpath(os.path.join(app_dir_str, filename))
+        if not file_path.startswith(app_dir_str + os.sep):
             raise ValueError(f"Invalid filename: {filename}")
 
+        # For manifest.json, parse once: the result validates the content, is
+        # written back normalized and seeds the read_manifest cache
+        if filename == "manifest.json":
+            try:
+                manifest = orjson.loads(content)
+            except orjson.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON content: {e}")
+            self.write_manifest(user_id, app_id, manifest)
+            return manifest
+
         with open(file_path, 'w') as f:
             f.write(content)
 
         logger.info(f"Updated {filename} in {app_id}")
+        return None
 
 
 # Global instance
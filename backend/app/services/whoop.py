@@ -4,14 +4,42 @@ Handles OAuth flow and fitness data synchronization (recovery, sleep, workouts,
 """
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime, timedelta
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
+from urllib.parse import quote, urlencode
+
 import requests
+from requests.adapters import HTTPAdapter
 
 from app.config import settings
 
 # Thread pool for running sync API calls
-_executor = ThreadPoolExecutor(max_workers=4)
+_MAX_WORKERS = 4
+_executor = ThreadPoolExecutor(max_workers=_MAX_WORKERS)
+
+
+@dataclass(slots=True, frozen=True)
+class WhoopCreds:
+    """Parsed Whoop OAuth credentials with prebuilt request headers."""
+    access_token: str
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None
+    auth_headers: dict[str, str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(
+            self, "auth_headers", {"Authorization": f"Bearer {self.access_token}"}
+        )
+
+    @classmethod
+    def from_dict(cls, credentials_dict: dict) -> "WhoopCreds":
+        """Build from the credentials dict stored on a DataSource."""
+        return cls(
+            access_token=credentials_dict.get("access_token"),
+            refresh_token=credentials_dict.get("refresh_token"),
+            expires_in=credentials_dict.get("expires_in"),
+        )
 
 
 class WhoopService:
@@ -29,12 +57,19 @@ class WhoopService:
         "read:profile",
         "offline",  # Required for refresh tokens
     ]
+    _SCOPE_STR = " ".join(SCOPES)
 
     def __init__(self):
         """Initialize Whoop service."""
         self.client_id = settings.whoop_client_id
         self.client_secret = settings.whoop_client_secret
 
+        # Shared keep-alive pool so every user's sync reuses the same TLS
+        # connections to the Whoop API; one slot per executor thread
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=_MAX_WORKERS)
+        self._session.mount("https://", adapter)
+
     def create_authorization_url(self, redirect_uri: str, state: str) -> str:
         """
         Create OAuth authorization URL.
@@ -46,18 +81,15 @@ class WhoopService:
         Returns:
             str: Authorization URL for user to visit
         """
-        scope = " ".join(self.SCOPES)
-
         params = {
             "response_type": "code",
             "client_id": self.client_id,
             "redirect_uri": redirect_uri,
-            "scope": scope,
+            "scope": self._SCOPE_STR,
             "state": state,
         }
 
-        query_string = "&".join([f"{k}={requests.utils.quote(str(v))}" for k, v in params.items()])
-        return f"{self.AUTH_URL}?{query_string}"
+        return f"{self.AUTH_URL}?{urlencode(params, quote_via=quote)}"
 
     def _exchange_code_for_tokens_sync(
         self, code: str, redirect_uri: str
@@ -71,7 +103,7 @@ class WhoopService:
             "client_secret": self.client_secret,
         }
 
-        response = requests.post(self.TOKEN_URL, data=data)
+        response = self._session.post(self.TOKEN_URL, data=data)
         response.raise_for_status()
         token_data = response.json()
 
@@ -95,20 +127,16 @@ class WhoopService:
         )
 
     def _make_api_request_sync(
-        self, endpoint: str, access_token: str, params: Optional[dict] = None
+        self, endpoint: str, creds: WhoopCreds, params: Optional[dict] = None
     ) -> dict[str, Any]:
         """Make authenticated API request."""
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-        }
-
         url = f"{self.BASE_URL}{endpoint}"
-        response = requests.get(url, headers=headers, params=params)
+        response = self._session.get(url, headers=creds.auth_headers, params=params)
         response.raise_for_status()
         return response.json()
 
     async def _make_api_request(
-        self, endpoint: str, access_token: str, params: Optional[dict] = None
+        self, endpoint: str, creds: WhoopCreds, params: Optional[dict] = None
     ) -> dict[str, Any]:
         """Make authenticated API request (async)."""
         loop = asyncio.get_event_loop()
@@ -116,84 +144,74 @@ class WhoopService:
             _executor,
             self._make_api_request_sync,
             endpoint,
-            access_token,
+            creds,
             params
         )
 
+    @staticmethod
+    def window_params(days_back: int) -> dict[str, str]:
+        """Build the start/end query params covering the last `days_back` days."""
+        end_date = datetime.now(timezone.utc)
+        start_date = end_date - timedelta(days=days_back)
+        return {
+            "start": start_date.isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+            "end": end_date.isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+        }
+
     async def fetch_recovery_data(
-        self, credentials_dict: dict, days_back: int = 7
+        self, creds: WhoopCreds, days_back: int = 7, window: Optional[dict] = None
     ) -> list[dict[str, Any]]:
         """
         Fetch recovery scores from Whoop.
 
         Args:
-            credentials_dict: OAuth credentials
+            creds: Parsed OAuth credentials
             days_back: Number of days to fetch
+            window: Precomputed start/end params (see window_params)
 
         Returns:
             list: Recovery data
         """
-        access_token = credentials_dict.get("access_token")
+        params = window or self.window_params(days_back)
 
-        # Calculate date range
-        end_date = datetime.utcnow()
-        start_date = end_date - timedelta(days=days_back)
-
-        params = {
-            "start": start_date.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
-            "end": end_date.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
-        }
-
-        data = await self._make_api_request("/developer/v1/recovery", access_token, params)
+        data = await self._make_api_request("/developer/v1/recovery", creds, params)
         return data.get("records", [])
 
     async def fetch_sleep_data(
-        self, credentials_dict: dict, days_back: int = 7
+        self, creds: WhoopCreds, days_back: int = 7, window: Optional[dict] = None
     ) -> list[dict[str, Any]]:
         """Fetch sleep data from Whoop."""
-        access_token = credentials_dict.get("access_token")
-
-        end_date = datetime.utcnow()
-        start_date = end_date - timedelta(days=days_back)
+        params = window or self.window_params(days_back)
 
-        params = {
-            "start": start_date.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
-            "end": end_date.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
-        }
-
-        data = await self._make_api_request("/developer/v1/activity/sleep", access_token, params)
+        data = await self._make_api_request("/developer/v1/activity/sleep", creds, params)
         return data.get("records", [])
 
     async def fetch_workout_data(
-        self, credentials_dict: dict, days_back: int = 7
+        self, creds: WhoopCreds, days_back: int = 7, window: Optional[dict] = None
     ) -> list[dict[str, Any]]:
         """Fetch workout data from Whoop."""
-        access_token = credentials_dict.get("access_token")
-
-        end_date = datetime.utcnow()
-        start_date = end_date - timedelta(days=days_back)
-
-        params = {
-            "start": start_date.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
-            "end": end_date.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
-        }
+        params = window or self.window_params(days_back)
 
-        data = await self._make_api_request("/developer/v1/activity/workout", access_token, params)
+        data = await self._make_api_request("/developer/v1/activity/workout", creds, params)
         return data.get("records", [])
 
     async def fetch_cycle_data(
-        self, credentials_dict: dict, days_back: int = 7
+        self, creds: WhoopCreds, days_back: int = 7, window: Optional[dict] = None
     ) -> list[dict[str, Any]]:
         """Fetch physiological cycle data from Whoop."""
-        access_token = credentials_dict.get("access_token")
+        params = window or self.window_params(days_back)
 
-        end_date = datetime.utcnow()
-        start_date = end_date - timedelta(days=days_back)
+        data = await self._make_api_request("/developer/v1/cycle", creds, params)
+        return data.get("records", [])
 
-        params = {
-            "start": start_date.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
-            "end": end_date.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
-        }
 
-        data = await self._make_api_request("/developer/v1/cycle", access_token, params)
-        return data.get("records", [])
+# Global instance
+_whoop_service: Optional[WhoopService] = None
+
+
+def get_whoop_service() -> WhoopService:
+    """Get the global WhoopService instance."""
+    global _whoop_service
+    if _whoop_service is None:
+        _whoop_service = WhoopService()
+    return _whoop_service
@@ -2,19 +2,38 @@
 Security utilities for authentication and authorization.
 LLM-friendly with clear type annotations and standard patterns.
 """
-from datetime import datetime, timedelta
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 from typing import Optional
 
+import bcrypt
+import orjson
 from jose import jwt
-from passlib.context import CryptContext
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.models.user import User
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt only uses the first 72 bytes of a password
+_BCRYPT_MAX_BYTES = 72
+
+# Thread pool for bcrypt so hashing never blocks the event loop
+_BCRYPT_POOL = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="bcrypt")
+
+# Base64url header segment shared by every HS256 token we issue
+_JWT_HS256_HEADER_B64 = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b"=")
+
+# Decoded JWT payloads keyed by a digest of the token, evicted LRU or on expiry
+_TOKEN_CACHE_MAX = 10_000
+_TOKEN_CACHE: "OrderedDict[bytes, tuple[dict, float]]" = OrderedDict()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -28,7 +47,13 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         bool: True if password matches
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return bcrypt.checkpw(
+            plain_password.encode()[:_BCRYPT_MAX_BYTES], hashed_password.encode()
+        )
+    except ValueError:
+        # Malformed or non-bcrypt hash
+        return False
 
 
 def get_password_hash(password: str) -> str:
@@ -41,7 +66,59 @@ def get_password_hash(password: str) -> str:
     Returns:
         str: Hashed password
     """
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(
+        password.encode()[:_BCRYPT_MAX_BYTES],
+        bcrypt.gensalt(rounds=settings.bcrypt_rounds),
+    ).decode()
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Check whether a stored hash was made with a different bcrypt cost.
+
+    Args:
+        hashed_password: Hashed password from database
+
+    Returns:
+        bool: True if the hash should be regenerated with the current cost
+    """
+    # bcrypt hashes look like $2b$<cost>$<salt+digest>
+    try:
+        return int(hashed_password.split("$")[2]) != settings.bcrypt_rounds
+    except (IndexError, ValueError):
+        return True
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """Async variant of verify_password that runs bcrypt in a worker thread."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _BCRYPT_POOL, verify_password, plain_password, hashed_password
+    )
+
+
+async def aget_password_hash(password: str) -> str:
+    """Async variant of get_password_hash that runs bcrypt in a worker thread."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_BCRYPT_POOL, get_password_hash, password)
+
+
+# Hash checked against when no user matches, so lookups take equal time.
+# Made on first use (in the bcrypt pool) so importing this module costs no hash
+_dummy_password_hash: Optional[str] = None
+
+
+async def _get_dummy_password_hash() -> str:
+    """Return the dummy hash, hashing it at the configured cost on first use."""
+    global _dummy_password_hash
+    if _dummy_password_hash is None:
+        _dummy_password_hash = await aget_password_hash("!invalid-password-placeholder!")
+    return _dummy_password_hash
+
+
+def _b64url(raw: bytes) -> bytes:
+    """Unpadded base64url encoding, as used by JWT segments."""
+    return base64.urlsafe_b64encode(raw).rstrip(b"=")
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -55,23 +132,58 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     Returns:
         str: JWT token
     """
-    to_encode = data.copy()
-    
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(
-            minutes=settings.access_token_expire_minutes
-        )
-    
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(
-        to_encode, 
-        settings.secret_key, 
-        algorithm=settings.algorithm
-    )
-    
-    return encoded_jwt
+    if expires_delta is None:
+        expires_delta = timedelta(minutes=settings.access_token_expire_minutes)
+
+    to_encode = {**data, "exp": int(time.time() + expires_delta.total_seconds())}
+
+    if settings.algorithm != "HS256":
+        return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+
+    # HS256 fast path: fixed header segment, orjson payload, direct HMAC
+    payload_b64 = _b64url(orjson.dumps(to_encode))
+    signing_input = _JWT_HS256_HEADER_B64 + b"." + payload_b64
+    signature = hmac.new(
+        settings.secret_key.encode(), signing_input, hashlib.sha256
+    ).digest()
+
+    return (signing_input + b"." + _b64url(signature)).decode()
+
+
+def verify_access_token(token: str) -> dict:
+    """
+    Decode and verify a JWT access token, caching the verified payload.
+
+    Repeat requests with the same token skip signature verification and JSON
+    parsing until the token expires.
+
+    Args:
+        token: Encoded JWT
+
+    Returns:
+        dict: Decoded token payload
+
+    Raises:
+        JWTError: If the token is invalid or expired
+    """
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    cached = _TOKEN_CACHE.get(key)
+    if cached is not None:
+        payload, expires_at = cached
+        if expires_at > time.time():
+            _TOKEN_CACHE.move_to_end(key)
+            return payload
+        del _TOKEN_CACHE[key]
+
+    payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+
+    exp = payload.get("exp")
+    if exp is not None:
+        _TOKEN_CACHE[key] = (payload, float(exp))
+        if len(_TOKEN_CACHE) > _TOKEN_CACHE_MAX:
+            _TOKEN_CACHE.popitem(last=False)
+
+    return payload
 
 
 async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
@@ -86,7 +198,7 @@ async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
         Optional[User]: User if found, None otherwise
     """
     result = await db.execute(
-        select(User).where(User.email == email)
+        select(User).where(func.lower(User.email) == email.lower()).limit(1)
     )
     return result.scalar_one_or_none()
 
@@ -102,10 +214,8 @@ async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
     Returns:
         Optional[User]: User if found, None otherwise
     """
-    result = await db.execute(
-        select(User).where(User.id == user_id)
-    )
-    return result.scalar_one_or_none()
+    # Session.get consults the identity map before issuing a SELECT
+    return await db.get(User, user_id)
 
 
 async def authenticate_user(
@@ -124,14 +234,30 @@ async def authenticate_user(
     Returns:
         Optional[User]: Authenticated user if credentials valid
     """
-    user = await get_user_by_email(db, email)
-    
-    if not user:
-        return None
-        
-    if not verify_password(password, user.hashed_password):
+    # Only fetch what password verification needs; the full row is loaded
+    # after the password checks out
+    result = await db.execute(
+        select(User.id, User.hashed_password)
+        .where(func.lower(User.email) == email.lower())
+        .limit(1)
+    )
+    row = result.first()
+
+    # Always run bcrypt, even for unknown emails, so response time does not
+    # reveal which emails are registered
+    hashed_password = row.hashed_password if row else await _get_dummy_password_hash()
+    password_valid = await averify_password(password, hashed_password)
+
+    if not row or not password_valid:
         return None
-        
+
+    user = await db.get(User, row.id)
+
+    # Lazily upgrade hashes made with an older cost factor
+    if password_needs_rehash(row.hashed_password):
+        user.hashed_password = await aget_password_hash(password)
+        await db.commit()
+
     return user
 
 
@@ -155,7 +281,7 @@ async def create_user(
     Returns:
         User: Created user object
     """
-    hashed_password = get_password_hash(password)
+    hashed_password = await aget_password_hash(password)
     
     user = User(
         email=email,
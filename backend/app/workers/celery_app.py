@@ -2,11 +2,19 @@
 Celery configuration for background tasks.
 Handles data sync, reminders, and AI analysis jobs.
 """
+import asyncio
+import logging
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_process_init
 
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 # Create Celery app
 celery_app = Celery(
     "krilin_ai",
@@ -25,15 +33,27 @@ celery_app.conf.update(
     task_track_started=True,
     task_time_limit=30 * 60,  # 30 minutes
     task_soft_time_limit=25 * 60,  # 25 minutes
+    # Sync tasks are long, I/O-bound API calls: only reserve one task at a
+    # time and ack after completion so a lost worker's task is redelivered.
+    # Tasks must therefore be safe to run more than once.
     worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    task_acks_on_failure_or_timeout=True,
     worker_max_tasks_per_child=100,
+    # Long-running per-source syncs get their own queue and workers so
+    # they can't hold up short tasks such as reminders
+    task_routes={
+        "app.workers.tasks.sync_user_data_source": {"queue": "sync"},
+        "app.workers.tasks.sync_data_source_task": {"queue": "sync"},
+    },
 )
 
-# Beat schedule for periodic tasks
+# Beat schedule for periodic tasks (the only place they are registered)
 celery_app.conf.beat_schedule = {
     "sync-all-data-sources": {
         "task": "app.workers.tasks.sync_all_data_sources",
-        "schedule": 300.0,  # Every 5 minutes
+        "schedule": crontab(minute="*/5"),  # Every 5 minutes, wall-clock aligned
     },
     "process-morning-reminders": {
         "task": "app.workers.tasks.process_morning_reminders",
@@ -43,4 +63,67 @@ celery_app.conf.beat_schedule = {
         "task": "app.workers.tasks.analyze_goal_progress",
         "schedule": crontab(hour=20, minute=0),  # 8:00 PM daily
     },
-}
\ No newline at end of file
+}
+
+# ========== Worker Event Loop ==========
+
+T = TypeVar("T")
+
+# One long-lived event loop per worker process, run on a background thread, so
+# tasks reuse it (and anything bound to it, like DB connections) instead of
+# paying for a fresh loop via asyncio.run() on every task
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+_worker_loop_lock = threading.Lock()
+
+
+def _start_worker_loop() -> asyncio.AbstractEventLoop:
+    """Start an event loop running forever on a daemon thread."""
+    loop = asyncio.new_event_loop()
+    threading.Thread(
+        target=loop.run_forever, name="celery-event-loop", daemon=True
+    ).start()
+    return loop
+
+
+@worker_process_init.connect
+def _init_worker_loop(**kwargs) -> None:
+    """Give each forked worker process its own event loop thread and DB pool."""
+    global _worker_loop
+    _worker_loop = _start_worker_loop()
+
+    from app.database import engine, warm_db_pool
+
+    # Drop any connections inherited from the parent across fork without
+    # closing them, so each child process opens its own
+    engine.sync_engine.dispose(close=False)
+
+    try:
+        run_async(warm_db_pool(settings.db_worker_pool_size))
+    except Exception as e:
+        # Not fatal: the pool connects lazily on first use instead
+        logger.warning(f"Could not pre-warm database pool: {e}")
+
+
+def run_async(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine on the worker's persistent event loop and wait for it.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    global _worker_loop
+    if _worker_loop is None:
+        with _worker_loop_lock:
+            if _worker_loop is None:
+                _worker_loop = _start_worker_loop()
+
+    future = asyncio.run_coroutine_threadsafe(coro, _worker_loop)
+    try:
+        return future.result()
+    except BaseException:
+        # e.g. SoftTimeLimitExceeded raised while waiting: stop the coroutine too
+        future.cancel()
+        raise
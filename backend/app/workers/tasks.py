@@ -2,22 +2,47 @@
 Celery background tasks for Krilin AI.
 Handles data synchronization, reminders, and AI analysis.
 """
+import asyncio
+import logging
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, Optional
 
-from celery import current_task
-from sqlalchemy import select
+from celery import chord, current_task, group
+from redis.asyncio import Redis
+from redis.exceptions import LockError
+from sqlalchemy import func, or_, select, update
 
+import app.models  # noqa: F401  Registers all mappers and relationships
+from app.config import settings
 from app.database import AsyncSessionLocal
 from app.models.data_source import DataSource, DataRecord, SyncHistory
 from app.models.goal import Goal, Reminder
-from app.models.user import User
 # TODO: Update to use App models when app execution is implemented
 # from app.models.marketplace import App, AppInstallation
-from app.workers.celery_app import celery_app
+from app.services.integrations import get_sync_service
+from app.services.sync_engine import get_sync_engine
+from app.workers.celery_app import celery_app, run_async
 
-# Import all models to ensure relationships are properly configured
-from app.models import user, conversation, goal, data_source, community, marketplace
+logger = logging.getLogger(__name__)
+
+# Number of parallel shards (by user_id) the periodic sync dispatch is split into
+SYNC_SHARD_COUNT = 4
+
+# Number of due data sources fetched and dispatched per batch
+SYNC_DISPATCH_BATCH_SIZE = 500
+
+# Number of reminders handled per send_reminder_batch task
+REMINDER_BATCH_SIZE = 500
+
+# Number of goals handled per analyze_goal_batch task
+GOAL_ANALYSIS_BATCH_SIZE = 100
+
+# Per-source sync lock TTL in seconds; the running sync keeps extending it,
+# so a lock left behind by a crashed worker frees up within this window
+SYNC_LOCK_TTL = 60
+
+# Redis client for per-source sync locks
+_redis: Optional[Redis] = None
 
 
 def utcnow():
@@ -25,47 +50,77 @@ def utcnow():
     return datetime.now(timezone.utc)
 
 
+def _get_redis() -> Redis:
+    """Get this worker process's Redis client (lazy initialization)."""
+    global _redis
+    if _redis is None:
+        _redis = Redis.from_url(settings.redis_url)
+    return _redis
+
+
+def _chunked(items: list, size: int) -> list[list]:
+    """Split a list into consecutive chunks of at most `size` items."""
+    return [list(items[i:i + size]) for i in range(0, len(items), size)]
+
+
 # ========== Data Source Synchronization ==========
 
 @celery_app.task(bind=True)
 def sync_all_data_sources(self):
     """
     Sync all active data sources.
-    Runs hourly via Celery Beat.
-    """
-    import asyncio
-    return asyncio.run(_sync_all_data_sources_async())
+    Runs every 5 minutes via Celery Beat.
 
+    Fans out one sync_data_source_shard task per user_id shard so finding and
+    dispatching due sources runs in parallel across workers.
+    """
+    group(
+        [sync_data_source_shard.s(shard, SYNC_SHARD_COUNT) for shard in range(SYNC_SHARD_COUNT)]
+    ).apply_async()
+    return {"status": "success", "shards": SYNC_SHARD_COUNT}
 
-async def _sync_all_data_sources_async() -> dict[str, Any]:
-    """Async implementation of syncing all data sources."""
-    async with AsyncSessionLocal() as db:
-        now = utcnow()
 
-        # Find sources due for sync
-        result = await db.execute(
-            select(DataSource).where(
-                DataSource.is_active == True,
-                DataSource.auto_sync == True,
-                DataSource.status == "active"
-            )
-        )
-        sources = result.scalars().all()
+@celery_app.task(bind=True)
+def sync_data_source_shard(self, shard: int, shard_count: int):
+    """
+    Dispatch syncs for due data sources whose user_id falls in one shard.
 
-        synced_count = 0
+    Args:
+        shard: Shard index (user_id % shard_count)
+        shard_count: Total number of shards
+    """
+    return run_async(_sync_data_source_shard_async(shard, shard_count))
 
-        for source in sources:
-            # Check if sync is due
-            if source.last_sync_at:
-                next_sync = source.last_sync_at + timedelta(seconds=source.sync_frequency)
-                if now < next_sync:
-                    continue
 
-            # Trigger individual sync
-            sync_user_data_source.delay(source.user_id, source.id)
-            synced_count += 1
+async def _sync_data_source_shard_async(shard: int, shard_count: int) -> dict[str, Any]:
+    """Async implementation of dispatching one shard's due data sources."""
+    async with AsyncSessionLocal() as db:
+        now = utcnow()
 
-        return {"status": "success", "sources_triggered": synced_count}
+        # Find sources due for sync (never synced, or sync_frequency elapsed)
+        stmt = select(DataSource.id, DataSource.user_id).where(
+            DataSource.is_active == True,
+            DataSource.auto_sync == True,
+            DataSource.status == "active",
+            DataSource.user_id % shard_count == shard,
+            or_(
+                DataSource.last_sync_at.is_(None),
+                DataSource.last_sync_at
+                + func.make_interval(0, 0, 0, 0, 0, 0, DataSource.sync_frequency)
+                <= now,
+            ),
+        ).execution_options(yield_per=SYNC_DISPATCH_BATCH_SIZE)
+
+        # Stream due (id, user_id) rows and publish each chunk as one group
+        triggered = 0
+        result = await db.stream(stmt)
+        async for rows in result.partitions():
+            group(
+                [sync_user_data_source.s(user_id, source_id) for source_id, user_id in rows]
+            ).apply_async()
+            triggered += len(rows)
+
+        return {"status": "success", "shard": shard, "sources_triggered": triggered}
 
 
 @celery_app.task(bind=True)
@@ -77,17 +132,62 @@ def sync_user_data_source(self, user_id: int, data_source_id: int):
         user_id: User ID
         data_source_id: Data source ID
     """
-    import asyncio
-    return asyncio.run(_sync_user_data_source_async(data_source_id))
+    return run_async(_sync_user_data_source_async(data_source_id, self.request.id))
 
 
-async def _sync_user_data_source_async(data_source_id: int) -> dict[str, Any]:
-    """Async implementation of individual data source sync."""
-    # Import here to get fresh session in each task
-    from app.database import AsyncSessionLocal
+async def _sync_user_data_source_async(
+    data_source_id: int, task_id: Optional[str] = None
+) -> dict[str, Any]:
+    """
+    Sync a data source while holding its Redis sync lock.
+
+    The same source can be queued again (next beat tick, late-ack redelivery)
+    before a slow sync finishes; only one run per source does the work.
+    The lock token is the Celery task id, so a redelivery of a task whose
+    worker crashed mid-sync takes over its own stale lock instead of skipping.
+    """
+    lock = _get_redis().lock(f"sync-lock:{data_source_id}", timeout=SYNC_LOCK_TTL)
+    if not await lock.acquire(blocking=False, token=task_id):
+        if task_id is None:
+            return {"status": "skipped", "reason": "Sync already running"}
+        lock.local.token = task_id.encode()
+        if not await lock.owned():
+            lock.local.token = None
+            return {"status": "skipped", "reason": "Sync already running"}
+        logger.info(
+            "Taking over sync lock for data source %s (task %s redelivered)",
+            data_source_id,
+            task_id,
+        )
 
+    heartbeat = asyncio.create_task(_extend_sync_lock(lock))
+    try:
+        return await _run_data_source_sync(data_source_id)
+    finally:
+        heartbeat.cancel()
+        try:
+            await lock.release()
+        except LockError:
+            # Lock expired (heartbeat missed the TTL) or was taken over
+            pass
+
+
+async def _extend_sync_lock(lock) -> None:
+    """Keep a held sync lock alive for as long as its sync is running."""
+    while True:
+        await asyncio.sleep(SYNC_LOCK_TTL / 3)
+        try:
+            await lock.extend(SYNC_LOCK_TTL, replace_ttl=True)
+        except LockError:
+            logger.warning("Lost sync lock %s while the sync was running", lock.name)
+            return
+
+
+async def _run_data_source_sync(data_source_id: int) -> dict[str, Any]:
+    """Async implementation of individual data source sync."""
     async with AsyncSessionLocal() as db:
-        # Get data source
+        # Get data source (no row lock: the Redis sync lock already serializes
+        # syncs per source, and a lock would be held across the external fetch)
         result = await db.execute(
             select(DataSource).where(DataSource.id == data_source_id)
         )
@@ -96,20 +196,18 @@ async def _sync_user_data_source_async(data_source_id: int) -> dict[str, Any]:
         if not source:
             return {"error": "Data source not found"}
 
-        # Create sync history record
+        # Create sync history record; committed up front so the sync shows
+        # as running while the fetch is in flight
+        started = utcnow()
         sync_record = SyncHistory(
             data_source_id=data_source_id,
-            started_at=utcnow(),
+            started_at=started,
             status="running"
         )
         db.add(sync_record)
         await db.commit()
-        await db.refresh(sync_record)
 
         try:
-            # Import appropriate sync service
-            from app.services.integrations import get_sync_service
-
             sync_service = get_sync_service(source.source_type)
 
             if not sync_service:
@@ -118,19 +216,27 @@ async def _sync_user_data_source_async(data_source_id: int) -> dict[str, Any]:
             # Perform sync
             records = await sync_service.sync(source, db)
 
+            # Count created vs updated records in a single pass
+            created = 0
+            for r in records:
+                if r.get("is_new"):
+                    created += 1
+
             # Update sync record
+            completed = utcnow()
             sync_record.status = "success"
-            sync_record.completed_at = utcnow()
-            sync_record.duration_seconds = (
-                sync_record.completed_at - sync_record.started_at
-            ).total_seconds()
+            sync_record.completed_at = completed
+            sync_record.duration_seconds = (completed - started).total_seconds()
             sync_record.records_processed = len(records)
-            sync_record.records_created = sum(1 for r in records if r.get("is_new"))
-            sync_record.records_updated = sum(1 for r in records if not r.get("is_new"))
-
-            # Update data source
-            source.last_sync_at = utcnow()
-            source.consecutive_failures = 0
+            sync_record.records_created = created
+            sync_record.records_updated = len(records) - created
+
+            # Update data source in the same transaction as the sync record
+            await db.execute(
+                update(DataSource)
+                .where(DataSource.id == data_source_id)
+                .values(last_sync_at=completed, consecutive_failures=0)
+            )
 
             await db.commit()
 
@@ -143,11 +249,10 @@ async def _sync_user_data_source_async(data_source_id: int) -> dict[str, Any]:
         except Exception as e:
             # Update sync record with error
             sync_record.status = "error"
+            completed = utcnow()
             sync_record.error_message = str(e)
-            sync_record.completed_at = utcnow()
-            sync_record.duration_seconds = (
-                sync_record.completed_at - sync_record.started_at
-            ).total_seconds()
+            sync_record.completed_at = completed
+            sync_record.duration_seconds = (completed - started).total_seconds()
 
             # Update data source error tracking
             source.consecutive_failures += 1
@@ -169,27 +274,67 @@ def process_morning_reminders(self):
     """
     Process morning reminders for all users.
     Runs daily at 7 AM via Celery Beat.
+
+    Fans out due reminders to send_reminder_batch tasks and sums their
+    results with a chord.
     """
-    import asyncio
-    return asyncio.run(_process_morning_reminders_async())
+    return run_async(_process_morning_reminders_async())
 
 
 async def _process_morning_reminders_async() -> dict[str, Any]:
-    """Generate and send morning reminders."""
+    """Dispatch due morning reminders to batch tasks."""
     async with AsyncSessionLocal() as db:
         now = utcnow()
 
         # Find reminders scheduled for morning
         result = await db.execute(
-            select(Reminder).where(
+            select(Reminder.id).where(
                 Reminder.is_sent == False,
                 Reminder.scheduled_for <= now,
                 Reminder.time_of_day == "morning"
             )
         )
+        reminder_ids = result.scalars().all()
+
+    batches = _chunked(reminder_ids, REMINDER_BATCH_SIZE)
+    if batches:
+        chord([send_reminder_batch.s(ids) for ids in batches])(
+            sum_batch_results.s("reminders_sent")
+        )
+
+    return {
+        "status": "success",
+        "reminders_queued": len(reminder_ids),
+        "batches": len(batches),
+    }
+
+
+@celery_app.task(bind=True)
+def send_reminder_batch(self, reminder_ids: list[int]):
+    """
+    Send a batch of reminders.
+
+    Args:
+        reminder_ids: IDs of reminders to send
+    """
+    return run_async(_send_reminder_batch_async(reminder_ids))
+
+
+async def _send_reminder_batch_async(reminder_ids: list[int]) -> dict[str, Any]:
+    """Send reminders in a batch and mark them sent with one UPDATE."""
+    async with AsyncSessionLocal() as db:
+        now = utcnow()
+
+        # Lock the batch's unsent reminders; skip_locked keeps a redelivered or
+        # overlapping batch from sending the same reminder twice
+        result = await db.execute(
+            select(Reminder)
+            .where(Reminder.id.in_(reminder_ids), Reminder.is_sent == False)
+            .with_for_update(skip_locked=True)
+        )
         reminders = result.scalars().all()
 
-        sent_count = 0
+        sent_ids: list[int] = []
 
         for reminder in reminders:
             try:
@@ -198,16 +343,22 @@ async def _process_morning_reminders_async() -> dict[str, Any]:
                 # - Push notification via FCM
                 # - SMS via Twilio
 
-                reminder.is_sent = True
-                reminder.sent_at = now
-                sent_count += 1
+                sent_ids.append(reminder.id)
 
-            except Exception as e:
-                print(f"Failed to send reminder {reminder.id}: {e}")
+            except Exception:
+                logger.exception("Failed to send reminder %s", reminder.id)
 
+        # Mark the whole batch as sent with a single UPDATE
+        if sent_ids:
+            await db.execute(
+                update(Reminder)
+                .where(Reminder.id.in_(sent_ids))
+                .values(is_sent=True, sent_at=now)
+                .execution_options(synchronize_session=False)
+            )
         await db.commit()
 
-        return {"status": "success", "reminders_sent": sent_count}
+        return {"status": "success", "reminders_sent": len(sent_ids)}
 
 
 # ========== Goal Analysis ==========
@@ -217,19 +368,57 @@ def analyze_goal_progress(self):
     """
     Analyze goal progress for all active goals.
     Runs daily via Celery Beat.
+
+    Fans out active goals to analyze_goal_batch tasks and sums their results
+    with a chord.
     """
-    import asyncio
-    return asyncio.run(_analyze_goal_progress_async())
+    return run_async(_analyze_goal_progress_async())
 
 
 async def _analyze_goal_progress_async() -> dict[str, Any]:
-    """Use AI agents to analyze goal progress."""
+    """Dispatch active goals to batch analysis tasks."""
     async with AsyncSessionLocal() as db:
         # Find active goals
         result = await db.execute(
-            select(Goal).where(Goal.status == "active")
+            select(Goal.id).where(Goal.status == "active")
+        )
+        goal_ids = result.scalars().all()
+
+    batches = _chunked(goal_ids, GOAL_ANALYSIS_BATCH_SIZE)
+    if batches:
+        chord([analyze_goal_batch.s(ids) for ids in batches])(
+            sum_batch_results.s("goals_analyzed")
         )
-        goals = result.scalars().all()
+
+    return {
+        "status": "success",
+        "goals_queued": len(goal_ids),
+        "batches": len(batches),
+    }
+
+
+@celery_app.task(bind=True)
+def analyze_goal_batch(self, goal_ids: list[int]):
+    """
+    Analyze progress for a batch of goals.
+
+    Args:
+        goal_ids: IDs of goals to analyze
+    """
+    return run_async(_analyze_goal_batch_async(goal_ids))
+
+
+async def _analyze_goal_batch_async(goal_ids: list[int]) -> dict[str, Any]:
+    """Use AI agents to analyze goal progress."""
+    async with AsyncSessionLocal() as db:
+        # Only the fields the analysis reads, as plain rows
+        result = await db.execute(
+            select(
+                Goal.id, Goal.user_id, Goal.title, Goal.category,
+                Goal.current_progress, Goal.progress_metrics, Goal.target_date,
+            ).where(Goal.id.in_(goal_ids))
+        )
+        goals = result.all()
 
         analyzed_count = 0
 
@@ -243,12 +432,24 @@ async def _analyze_goal_progress_async() -> dict[str, Any]:
 
                 analyzed_count += 1
 
-            except Exception as e:
-                print(f"Failed to analyze goal {goal.id}: {e}")
+            except Exception:
+                logger.exception("Failed to analyze goal %s", goal.id)
 
         return {"status": "success", "goals_analyzed": analyzed_count}
 
 
+@celery_app.task
+def sum_batch_results(results: list[dict[str, Any]], key: str) -> dict[str, Any]:
+    """
+    Chord callback that totals one counter across batch task results.
+
+    Args:
+        results: Return values of the batch tasks
+        key: Counter to sum (e.g. "reminders_sent")
+    """
+    return {"status": "success", key: sum(r.get(key, 0) for r in results)}
+
+
 @celery_app.task(bind=True)
 def update_goal_progress_from_data(self, user_id: int, goal_id: int):
     """
@@ -258,8 +459,7 @@ def update_goal_progress_from_data(self, user_id: int, goal_id: int):
         user_id: User ID
         goal_id: Goal ID
     """
-    import asyncio
-    return asyncio.run(_update_goal_progress_from_data_async(user_id, goal_id))
+    return run_async(_update_goal_progress_from_data_async(user_id, goal_id))
 
 
 async def _update_goal_progress_from_data_async(user_id: int, goal_id: int) -> dict[str, Any]:
@@ -267,26 +467,26 @@ async def _update_goal_progress_from_data_async(user_id: int, goal_id: int) -> d
     async with AsyncSessionLocal() as db:
         # Get goal
         result = await db.execute(
-            select(Goal).where(
+            select(Goal.id, Goal.category, Goal.progress_metrics).where(
                 Goal.id == goal_id,
                 Goal.user_id == user_id
             )
         )
-        goal = result.scalar_one_or_none()
+        goal = result.one_or_none()
 
         if not goal:
             return {"error": "Goal not found"}
 
-        # Get recent data records
+        # Count recent data records in SQL instead of loading them
         seven_days_ago = utcnow() - timedelta(days=7)
 
         data_result = await db.execute(
-            select(DataRecord).where(
+            select(func.count()).select_from(DataRecord).where(
                 DataRecord.user_id == user_id,
                 DataRecord.record_date >= seven_days_ago
             )
         )
-        records = data_result.scalars().all()
+        records_analyzed = data_result.scalar_one()
 
         try:
             # TODO: Analyze data for progress
@@ -294,7 +494,7 @@ async def _update_goal_progress_from_data_async(user_id: int, goal_id: int) -> d
             # - Learning goals from calendar
             # - Social goals from communication
 
-            return {"status": "success", "records_analyzed": len(records)}
+            return {"status": "success", "records_analyzed": records_analyzed}
 
         except Exception as e:
             return {"status": "error", "error": str(e)}
@@ -311,8 +511,7 @@ def parse_email_for_expenses(self, user_id: int, email_data: dict):
         user_id: User ID
         email_data: Email content and metadata
     """
-    import asyncio
-    return asyncio.run(_parse_email_for_expenses_async(user_id, email_data))
+    return run_async(_parse_email_for_expenses_async(user_id, email_data))
 
 
 async def _parse_email_for_expenses_async(user_id: int, email_data: dict) -> dict[str, Any]:
@@ -340,8 +539,7 @@ def generate_news_aggregation(self, user_id: int):
     Args:
         user_id: User ID
     """
-    import asyncio
-    return asyncio.run(_generate_news_aggregation_async(user_id))
+    return run_async(_generate_news_aggregation_async(user_id))
 
 
 async def _generate_news_aggregation_async(user_id: int) -> dict[str, Any]:
@@ -349,12 +547,12 @@ async def _generate_news_aggregation_async(user_id: int) -> dict[str, Any]:
     async with AsyncSessionLocal() as db:
         # Get user's active goals
         result = await db.execute(
-            select(Goal).where(
+            select(Goal.id, Goal.title, Goal.category).where(
                 Goal.user_id == user_id,
                 Goal.status == "active"
             )
         )
-        goals = result.scalars().all()
+        goals = result.all()
 
         try:
             # TODO: Fetch and aggregate news
@@ -397,8 +595,7 @@ def find_libgen_books(self, search_query: str, user_id: int, goal_id: int = None
         user_id: User ID
         goal_id: Optional goal ID to associate books with
     """
-    import asyncio
-    return asyncio.run(_find_libgen_books_async(search_query, user_id, goal_id))
+    return run_async(_find_libgen_books_async(search_query, user_id, goal_id))
 
 
 async def _find_libgen_books_async(search_query: str, user_id: int, goal_id: int = None) -> dict[str, Any]:
@@ -427,14 +624,11 @@ def sync_data_source_task(self, data_source_id: int, incremental: bool = True):
         data_source_id: Data source ID
         incremental: If True, only sync since last sync
     """
-    import asyncio
-    return asyncio.run(_sync_data_source_task_async(data_source_id, incremental))
+    return run_async(_sync_data_source_task_async(data_source_id, incremental))
 
 
 async def _sync_data_source_task_async(data_source_id: int, incremental: bool) -> dict[str, Any]:
     """Async implementation of data source sync."""
-    from app.services.sync_engine import get_sync_engine
-
     async with AsyncSessionLocal() as db:
         sync_engine = await get_sync_engine(db)
         result = await sync_engine.sync_data_source(data_source_id, incremental)
@@ -446,31 +640,3 @@ async def _sync_data_source_task_async(data_source_id: int, incremental: bool) -
             "records_updated": result.records_updated,
             "error": result.error
         }
-
-
-# ========== Celery Beat Schedule ==========
-
-@celery_app.on_after_finalize.connect
-def setup_periodic_tasks(sender, **kwargs):
-    """Setup periodic tasks using Celery Beat."""
-
-    # Sync all data sources every hour
-    sender.add_periodic_task(
-        3600.0,  # 1 hour
-        sync_all_data_sources.s(),
-        name='sync-all-data-sources-hourly'
-    )
-
-    # Process morning reminders at 7 AM UTC (adjust for timezone)
-    sender.add_periodic_task(
-        86400.0,  # Daily
-        process_morning_reminders.s(),
-        name='process-morning-reminders-daily'
-    )
-
-    # Analyze goal progress daily
-    sender.add_periodic_task(
-        86400.0,  # Daily
-        analyze_goal_progress.s(),
-        name='analyze-goal-progress-daily'
-    )
@@ -3,9 +3,92 @@ Google Calendar Events App Backend.
 
 Displays Google Calendar events in a nicely formatted view.
 """
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
+# Seconds an integration connectivity check is reused before re-querying
+CONNECTION_CACHE_TTL = 30
+
+# Upper bound on cached connectivity entries before the cache is reset
+CONNECTION_CACHE_MAX_SIZE = 10_000
+
+# (user_id, integration_id) -> (expires_at, is_connected)
+_connection_cache: dict[tuple[int, str], tuple[float, bool]] = {}
+
+
+async def _is_connected(ctx: Any, integration_id: str) -> bool:
+    """
+    Check whether an integration is connected, reusing recent results.
+
+    Args:
+        ctx: Platform context
+        integration_id: Integration ID
+
+    Returns:
+        True if connected, False otherwise
+    """
+    key = (ctx.user_id, integration_id)
+    now = time.monotonic()
+
+    cached = _connection_cache.get(key)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    connected = await ctx.integrations.is_connected(integration_id)
+
+    if len(_connection_cache) >= CONNECTION_CACHE_MAX_SIZE:
+        _connection_cache.clear()
+    _connection_cache[key] = (now + CONNECTION_CACHE_TTL, connected)
+
+    return connected
+
+
+def _format_event(event_data: dict[str, Any]) -> dict[str, Any]:
+    """
+    Format a Google Calendar API event for display.
+
+    Args:
+        event_data: Raw event from the integration
+
+    Returns:
+        Display-ready event dict
+    """
+    get = event_data.get
+    start_info = get("start", {})
+    end_info = get("end", {})
+    organizer = get("organizer")
+
+    return {
+        "id": get("id"),
+        "title": get("summary", "Untitled Event"),
+        "description": get("description"),
+        "start": start_info.get("dateTime") or start_info.get("date"),
+        "end": end_info.get("dateTime") or end_info.get("date"),
+        "location": get("location"),
+        "attendees": [
+            {
+                "email": attendee.get("email"),
+                "name": attendee.get("displayName"),
+                "status": attendee.get("responseStatus")
+            }
+            for attendee in get("attendees") or ()
+        ],
+        "organizer": {
+            "email": organizer.get("email"),
+            "name": organizer.get("displayName"),
+            "is_self": organizer.get("self", False)
+        } if organizer else None,
+        "html_link": get("htmlLink"),
+        "status": get("status"),
+        "color_id": get("colorId"),
+        "is_all_day": "date" in start_info,
+        "created": get("created"),
+        "updated": get("updated"),
+        "conference_data": get("conferenceData"),
+        "hangout_link": get("hangoutLink")
+    }
+
 
 async def get_events(
     ctx: Any,
@@ -26,7 +109,7 @@ async def get_events(
         Dict with events list
     """
     # Check if Google Calendar is connected
-    is_connected = await ctx.integrations.is_connected("google_calendar")
+    is_connected = await _is_connected(ctx, "google_calendar")
     if not is_connected:
         return {
             "success": False,
@@ -36,12 +119,12 @@ async def get_events(
 
     # Parse dates
     if start_date:
-        start = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
+        start = datetime.fromisoformat(start_date)
     else:
         start = datetime.now(timezone.utc)
 
     if end_date:
-        end = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
+        end = datetime.fromisoformat(end_date)
     else:
         end = start + timedelta(days=7)
 
@@ -68,41 +151,7 @@ async def get_events(
         }
 
     # Format events for display
-    events = []
-    for event_data in raw_events:
-        # Parse event data from Google Calendar API format
-        start_info = event_data.get("start", {})
-        end_info = event_data.get("end", {})
-
-        events.append({
-            "id": event_data.get("id"),
-            "title": event_data.get("summary", "Untitled Event"),
-            "description": event_data.get("description"),
-            "start": start_info.get("dateTime") or start_info.get("date"),
-            "end": end_info.get("dateTime") or end_info.get("date"),
-            "location": event_data.get("location"),
-            "attendees": [
-                {
-                    "email": attendee.get("email"),
-                    "name": attendee.get("displayName"),
-                    "status": attendee.get("responseStatus")
-                }
-                for attendee in event_data.get("attendees", [])
-            ] if event_data.get("attendees") else [],
-            "organizer": {
-                "email": event_data.get("organizer", {}).get("email"),
-                "name": event_data.get("organizer", {}).get("displayName"),
-                "is_self": event_data.get("organizer", {}).get("self", False)
-            } if event_data.get("organizer") else None,
-            "html_link": event_data.get("htmlLink"),
-            "status": event_data.get("status"),
-            "color_id": event_data.get("colorId"),
-            "is_all_day": "date" in start_info,
-            "created": event_data.get("created"),
-            "updated": event_data.get("updated"),
-            "conference_data": event_data.get("conferenceData"),
-            "hangout_link": event_data.get("hangoutLink")
-        })
+    events = [_format_event(event_data) for event_data in raw_events]
 
     return {
         "success": True,
@@ -144,26 +193,40 @@ async def get_next_event(ctx: Any) -> dict[str, Any]:
     Returns:
         Dict with next event or None
     """
-    now = datetime.now(timezone.utc)
-    end = now + timedelta(days=30)
+    if not await _is_connected(ctx, "google_calendar"):
+        return {
+            "success": False,
+            "error": "Google Calendar not connected. Please connect Google Calendar at /data-sources.",
+            "event": None
+        }
 
-    result = await get_events(
-        ctx,
-        start_date=now.isoformat(),
-        end_date=end.isoformat(),
-        max_results=1
-    )
+    # ORDER BY start LIMIT 1 needs no upper bound on the range
+    now = datetime.now(timezone.utc)
+    try:
+        raw_events = await ctx.integrations.query(
+            integration_id="google_calendar",
+            table="events",
+            where={"start": {"gte": now.isoformat()}},
+            limit=1,
+            order_by={"start": "asc"}
+        )
+    except Exception as e:
+        return {
+            "success": False,
+            "error": f"Failed to fetch events: {str(e)}",
+            "event": None
+        }
 
-    if result.get("success") and result.get("events"):
+    if raw_events:
         return {
             "success": True,
-            "event": result["events"][0]
+            "event": _format_event(raw_events[0])
         }
 
     return {
         "success": True,
         "event": None,
-        "message": "No upcoming events found in the next 30 days"
+        "message": "No upcoming events found"
     }
 
 
@@ -4,14 +4,18 @@ Habit Tracker Agent Tools
 Custom tools for the Habit Tracker's Claude agent.
 These tools allow the agent to interact with habit data.
 """
+import logging
 from typing import Dict, Any, List
 from app.core.platform_context import PlatformContext
 from . import backend
 
+logger = logging.getLogger(__name__)
+
 
 # Tool definitions
 # Each tool needs: name, description, parameters
-TOOLS = [
+# Read-only: shared by every agent instance, so never mutate in place
+TOOLS = (
     {
         "name": "view_habits",
         "description": "View all user's active habits with their current streaks",
@@ -91,7 +95,7 @@ TOOLS = [
             }
         }
     }
-]
+)
 
 
 # Tool implementations
@@ -149,31 +153,24 @@ async def create_new_habit(
     Returns:
         Created habit info
     """
-    try:
-        habit = await backend.create_habit(
-            ctx,
-            name=name,
-            description=description,
-            frequency=frequency,
-            category=category
-        )
+    habit = await backend.create_habit(
+        ctx,
+        name=name,
+        description=description,
+        frequency=frequency,
+        category=category
+    )
 
-        return {
-            "success": True,
-            "message": f"Created habit: {name}",
-            "habit": {
-                "id": habit["id"],
-                "name": habit["name"],
-                "frequency": habit["frequency"],
-                "category": habit["category"]
-            }
-        }
-
-    except Exception as e:
-        return {
-            "success": False,
-            "error": str(e)
+    return {
+        "success": True,
+        "message": f"Created habit: {name}",
+        "habit": {
+            "id": habit["id"],
+            "name": habit["name"],
+            "frequency": habit["frequency"],
+            "category": habit["category"]
         }
+    }
 
 
 async def log_habit_completion(
@@ -194,32 +191,33 @@ async def log_habit_completion(
     Returns:
         Log result with updated streak
     """
-    try:
-        log = await backend.log_habit(
-            ctx,
-            habit_id=habit_id,
-            notes=notes,
-            mood=mood
-        )
-
-        # Get updated streak
-        streak = await backend.calculate_streak(ctx, habit_id)
-
-        # Get habit name
-        habit = await ctx.storage.find_one("habits", {"id": habit_id})
+    with backend.habit_cache():
+        try:
+            log = await backend.log_habit(
+                ctx,
+                habit_id=habit_id,
+                notes=notes,
+                mood=mood
+            )
+        except ValueError as e:
+            # Unknown habit ID: report it back to the agent
+            logger.warning(
+                f"[HABIT TRACKER] Could not log habit {habit_id}", exc_info=True
+            )
+            return {
+                "success": False,
+                "error": str(e)
+            }
 
-        return {
-            "success": True,
-            "message": f"Logged completion of {habit['name']}! 🎉",
-            "current_streak": streak,
-            "log_id": log["id"]
-        }
+        # The streak log_habit just stored; served from the cache
+        habit = await backend.get_habit(ctx, habit_id)
 
-    except Exception as e:
-        return {
-            "success": False,
-            "error": str(e)
-        }
+    return {
+        "success": True,
+        "message": f"Logged completion of {habit['name']}! 🎉",
+        "current_streak": habit["current_streak"],
+        "log_id": log["id"]
+    }
 
 
 async def get_habit_stats(
@@ -236,24 +234,17 @@ async def get_habit_stats(
     Returns:
         Statistics dictionary
     """
-    try:
-        stats = await backend.get_stats(ctx, period=period)
+    stats = await backend.get_stats(ctx, period=period)
 
-        return {
-            "success": True,
-            "period": stats["period"],
-            "total_habits": stats["total_habits"],
-            "total_completions": stats["total_completions"],
-            "completion_rate": stats["completion_rate"],
-            "completed_today": stats["completed_today"],
-            "pending_today": stats["pending_today"]
-        }
-
-    except Exception as e:
-        return {
-            "success": False,
-            "error": str(e)
-        }
+    return {
+        "success": True,
+        "period": stats["period"],
+        "total_habits": stats["total_habits"],
+        "total_completions": stats["total_completions"],
+        "completion_rate": stats["completion_rate"],
+        "completed_today": stats["completed_today"],
+        "pending_today": stats["pending_today"]
+    }
 
 
 async def view_habit_history(
@@ -272,40 +263,33 @@ async def view_habit_history(
     Returns:
         History list
     """
-    try:
-        logs = await backend.get_logs_for_habit(
-            ctx,
-            habit_id=habit_id,
-            limit=limit
-        )
-
-        # Get habit name
-        habit = await ctx.storage.find_one("habits", {"id": habit_id})
-
-        if not habit:
-            return {
-                "success": False,
-                "error": "Habit not found"
-            }
-
-        # Format logs
-        history = []
-        for log in logs:
-            history.append({
-                "completed_at": log["completed_at"],
-                "notes": log.get("notes", ""),
-                "mood": log.get("mood", "")
-            })
-
-        return {
-            "success": True,
-            "habit_name": habit["name"],
-            "total_entries": len(history),
-            "history": history
-        }
+    # Get habit name (checked first so an unknown ID skips the log query)
+    habit = await backend.get_habit(ctx, habit_id)
 
-    except Exception as e:
+    if not habit:
         return {
             "success": False,
-            "error": str(e)
+            "error": "Habit not found"
         }
+
+    logs = await backend.get_logs_for_habit(
+        ctx,
+        habit_id=habit_id,
+        limit=limit
+    )
+
+    # Format logs
+    history = []
+    for log in logs:
+        history.append({
+            "completed_at": log["completed_at"],
+            "notes": log.get("notes", ""),
+            "mood": log.get("mood", "")
+        })
+
+    return {
+        "success": True,
+        "habit_name": habit["name"],
+        "total_entries": len(history),
+        "history": history
+    }
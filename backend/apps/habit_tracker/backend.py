@@ -12,14 +12,96 @@ All app actions receive a PlatformContext (ctx) which provides:
 - ctx.files - File operations
 - ctx.ai - AI/LLM capabilities
 """
-from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
+import asyncio
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+from datetime import date, timedelta
 import logging
 
 from app.core.platform_context import PlatformContext
 
 logger = logging.getLogger(__name__)
 
+# Strong references to in-flight fire-and-forget tasks so they aren't
+# garbage collected before they finish
+_background_tasks: set = set()
+
+# Habits fetched during the current agent tool invocation, keyed by ID.
+# Only set inside habit_cache(), so a cached row never outlives the
+# invocation that read it
+_habit_cache: ContextVar[Optional[Dict[str, Dict[str, Any]]]] = ContextVar(
+    "habit_cache", default=None
+)
+
+
+@contextmanager
+def habit_cache() -> Iterator[None]:
+    """
+    Memoize get_habit for the duration of the block.
+
+    Agent tools wrap one invocation in it, so the backend actions they call
+    share a single lookup of each habit. The cache is discarded on exit.
+    """
+    token = _habit_cache.set({})
+    try:
+        yield
+    finally:
+        _habit_cache.reset(token)
+
+
+def _remember_habit(habit: Dict[str, Any]) -> None:
+    """Store a freshly written habit row in the active habit_cache, if any."""
+    cache = _habit_cache.get()
+    if cache is not None:
+        cache[habit["id"]] = habit
+
+
+def _publish_in_background(
+    ctx: PlatformContext,
+    stream_id: str,
+    data: Dict[str, Any]
+) -> None:
+    """
+    Publish a stream event without making the caller wait for it.
+
+    Stream publishing goes to Redis rather than the request's database
+    session, so it can safely outlive the action that triggered it.
+    """
+    task = asyncio.create_task(ctx.streams.publish(stream_id, data))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def get_habit(
+    ctx: PlatformContext,
+    habit_id: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Get a single habit.
+
+    Memoized only inside habit_cache(): a context can outlive one request
+    (the app agent keeps its context), so caching on it could serve a stale
+    row.
+
+    Args:
+        ctx: Platform context
+        habit_id: Habit ID
+
+    Returns:
+        Habit record or None
+    """
+    cache = _habit_cache.get()
+    if cache is not None and habit_id in cache:
+        return cache[habit_id]
+
+    habit = await ctx.storage.find_one("habits", {"id": habit_id})
+    if cache is not None and habit is not None:
+        cache[habit_id] = habit
+
+    return habit
+
 
 async def get_habits(
     ctx: PlatformContext,
@@ -45,16 +127,53 @@ async def get_habits(
         order_by={"created_at": "desc"}
     )
 
-    # Enrich with streak data
+    # Streaks are stored on the habit; only habits created before that
+    # need their logs to compute one
+    legacy_ids = [
+        habit["id"] for habit in habits if "last_completed_date" not in habit
+    ]
+    logs_by_habit = await get_logs_by_habit(ctx, legacy_ids)
+
+    today = ctx.now().date()
     for habit in habits:
-        streak = await calculate_streak(ctx, habit["id"])
-        habit["current_streak"] = streak
+        if "last_completed_date" in habit:
+            habit["current_streak"] = stored_streak(habit, today)
+        else:
+            habit["current_streak"] = streak_from_logs(
+                habit, logs_by_habit.get(habit["id"], []), today
+            )
 
     logger.info(f"[HABIT TRACKER] Retrieved {len(habits)} habits for user {ctx.user_id}")
 
     return habits
 
 
+def _new_habit_record(
+    name: str,
+    frequency: str = "daily",
+    description: str = "",
+    target_count: int = 1,
+    category: str = "general",
+    color: str = "#3B82F6",
+    icon: str = "target"
+) -> Dict[str, Any]:
+    """Build the stored record for a new habit."""
+    return {
+        "name": name,
+        "description": description,
+        "frequency": frequency,
+        "target_count": target_count,
+        "category": category,
+        "color": color,
+        "icon": icon,
+        "active": True,
+        "archived_at": None,
+        "current_streak": 0,
+        "last_completed_date": None,
+        "last_completed_at": None
+    }
+
+
 async def create_habit(
     ctx: PlatformContext,
     name: str,
@@ -81,17 +200,15 @@ async def create_habit(
     Returns:
         Created habit record
     """
-    habit = await ctx.storage.insert("habits", {
-        "name": name,
-        "description": description,
-        "frequency": frequency,
-        "target_count": target_count,
-        "category": category,
-        "color": color,
-        "icon": icon,
-        "active": True,
-        "archived_at": None
-    })
+    habit = await ctx.storage.insert("habits", _new_habit_record(
+        name=name,
+        frequency=frequency,
+        description=description,
+        target_count=target_count,
+        category=category,
+        color=color,
+        icon=icon
+    ))
 
     logger.info(f"[HABIT TRACKER] Created habit: {name} (id: {habit['id']})")
 
@@ -121,7 +238,7 @@ async def update_habit(
         Updated habit record
     """
     # Verify habit exists and belongs to user
-    habit = await ctx.storage.find_one("habits", {"id": habit_id})
+    habit = await get_habit(ctx, habit_id)
 
     if not habit:
         raise ValueError(f"Habit {habit_id} not found")
@@ -132,6 +249,7 @@ async def update_habit(
         habit_id,
         updates
     )
+    _remember_habit(updated)
 
     logger.info(f"[HABIT TRACKER] Updated habit: {habit_id}")
 
@@ -181,15 +299,20 @@ async def log_habit(
         Created log record
     """
     # Verify habit exists
-    habit = await ctx.storage.find_one("habits", {"id": habit_id})
+    habit = await get_habit(ctx, habit_id)
 
     if not habit:
         raise ValueError(f"Habit {habit_id} not found")
 
+    # One clock reading for both the log and the streak day, so a log
+    # written across midnight can't land on a different day than its streak
+    now = ctx.now()
+    today = now.date()
+
     # Create log entry
     log = await ctx.storage.insert("habit_logs", {
         "habit_id": habit_id,
-        "completed_at": ctx.now().isoformat(),
+        "completed_at": now.isoformat(),
         "notes": notes,
         "mood": mood,
         "duration_minutes": duration_minutes
@@ -197,11 +320,35 @@ async def log_habit(
 
     logger.info(f"[HABIT TRACKER] Logged habit: {habit['name']} (id: {habit_id})")
 
-    # Calculate new streak
-    streak = await calculate_streak(ctx, habit_id)
+    # Advance the stored streak instead of recomputing it from all logs
+    last_completed = habit.get("last_completed_date")
 
-    # Publish event
-    await ctx.streams.publish("habit_completed", {
+    if "last_completed_date" not in habit:
+        # Habit predates stored streaks: compute it once from the logs
+        streak = await _streak_for_habit(ctx, habit, today)
+    elif habit.get("frequency") != "daily":
+        streak = habit.get("current_streak", 0) + 1
+    elif last_completed is None:
+        streak = 1
+    else:
+        days_since = (today - date.fromisoformat(last_completed)).days
+        if days_since == 0:
+            streak = habit.get("current_streak", 0)
+        elif days_since == 1:
+            streak = habit.get("current_streak", 0) + 1
+        else:
+            streak = 1
+
+    # The habit was verified above, so skip update_habit's lookup
+    updated = await ctx.storage.update("habits", habit_id, {
+        "current_streak": streak,
+        "last_completed_date": today.isoformat(),
+        "last_completed_at": log["completed_at"]
+    })
+    _remember_habit(updated)
+
+    # Publish event without waiting on Redis
+    _publish_in_background(ctx, "habit_completed", {
         "habit_id": habit_id,
         "habit_name": habit["name"],
         "streak": streak,
@@ -219,76 +366,192 @@ async def log_habit(
     return log
 
 
-async def calculate_streak(
+async def get_logs_by_habit(
     ctx: PlatformContext,
-    habit_id: str
-) -> int:
+    habit_ids: Iterable[str]
+) -> Dict[str, List[Dict[str, Any]]]:
     """
-    Calculate current streak for a habit.
-
-    Counts consecutive days with at least one completion.
+    Get logs for several habits with a single query.
 
     Args:
         ctx: Platform context
-        habit_id: Habit ID
+        habit_ids: Habit IDs
 
     Returns:
-        Current streak count (number of consecutive days)
+        Dict mapping habit ID to its logs, newest first
     """
-    # Get habit to check frequency
-    habit = await ctx.storage.find_one("habits", {"id": habit_id})
+    logs_by_habit: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
 
-    if not habit:
-        return 0
+    habit_ids = list(habit_ids)
+    if not habit_ids:
+        return logs_by_habit
 
-    # Get all logs for this habit, ordered by completion time (desc)
     logs = await ctx.storage.query(
         "habit_logs",
-        where={"habit_id": habit_id},
+        where={"habit_id__in": habit_ids},
         order_by={"completed_at": "desc"}
     )
 
-    if not logs:
-        return 0
+    for log in logs:
+        logs_by_habit[log["habit_id"]].append(log)
 
-    # For daily habits, calculate consecutive days
-    if habit.get("frequency") == "daily":
-        streak = 0
-        current_date = datetime.utcnow().date()
+    return logs_by_habit
+
+
+def stored_streak(habit: Dict[str, Any], today: date) -> int:
+    """
+    Get the current streak stored on a habit.
+
+    A daily streak that was not extended today or yesterday has lapsed and
+    counts as zero, even though the stored value is only reset on the
+    next completion.
+
+    Args:
+        habit: Habit record with current_streak and last_completed_date
+        today: The user's current date (from ctx.now())
 
-        # Check if completed today or yesterday (to start streak)
-        last_completed = datetime.fromisoformat(logs[0]["completed_at"]).date()
-        days_diff = (current_date - last_completed).days
+    Returns:
+        Current streak count
+    """
+    streak = habit.get("current_streak") or 0
 
-        if days_diff > 1:
-            # Streak broken
+    if habit.get("frequency") == "daily":
+        last_completed = habit.get("last_completed_date")
+        if not last_completed:
+            return 0
+        days_since = (today - date.fromisoformat(last_completed)).days
+        if days_since > 1:
             return 0
 
-        # Count backwards from today
-        check_date = current_date
-        log_index = 0
+    return streak
+
+
+def streak_from_dates(dates: List[date], today: date) -> int:
+    """
+    Calculate a daily streak from distinct completion dates.
+
+    Counts consecutive days with at least one completion.
+
+    Args:
+        dates: Distinct completion dates, newest first
+        today: The user's current date (from ctx.now())
+
+    Returns:
+        Current streak count (number of consecutive days)
+    """
+    if not dates:
+        return 0
+
+    # Check if completed today or yesterday (to start streak)
+    if (today - dates[0]).days > 1:
+        # Streak broken
+        return 0
+
+    # Count backwards from the latest completion (today or yesterday)
+    streak = 0
+    check_date = min(dates[0], today)
+    one_day = timedelta(days=1)
 
-        while log_index < len(logs):
-            log_date = datetime.fromisoformat(logs[log_index]["completed_at"]).date()
+    for completed_date in dates:
+        if completed_date == check_date:
+            streak += 1
+            check_date -= one_day
+        elif completed_date < check_date:
+            # Gap found, streak broken
+            break
+        # Dates after today shouldn't happen with desc order; skip them
 
-            if log_date == check_date:
-                streak += 1
-                log_index += 1
-                check_date -= timedelta(days=1)
-            elif log_date < check_date:
-                # Gap found, streak broken
-                break
-            else:
-                # Shouldn't happen with desc order, but safety check
-                log_index += 1
+    return streak
 
-        return streak
+
+def streak_from_logs(
+    habit: Dict[str, Any],
+    logs: List[Dict[str, Any]],
+    today: date
+) -> int:
+    """
+    Calculate current streak for a habit from its logs.
+
+    Args:
+        habit: Habit record
+        logs: Logs for the habit, ordered by completion time (desc)
+        today: The user's current date (from ctx.now())
+
+    Returns:
+        Current streak count (number of consecutive days)
+    """
+    # For daily habits, calculate consecutive days
+    if habit.get("frequency") == "daily":
+        # The ISO date prefix identifies the day without parsing the
+        # timestamp; only one date per distinct day is built
+        days = []
+        for log in logs:
+            day = log["completed_at"][:10]
+            if not days or days[-1] != day:
+                days.append(day)
+        return streak_from_dates([date.fromisoformat(day) for day in days], today)
 
     # For weekly habits, count consecutive weeks
     # (Simplified for MVP)
     return len(logs)
 
 
+async def calculate_streak(
+    ctx: PlatformContext,
+    habit_id: str
+) -> int:
+    """
+    Calculate current streak for a habit.
+
+    Counts consecutive days with at least one completion.
+
+    Args:
+        ctx: Platform context
+        habit_id: Habit ID
+
+    Returns:
+        Current streak count (number of consecutive days)
+    """
+    # Get habit to check frequency
+    habit = await get_habit(ctx, habit_id)
+
+    if not habit:
+        return 0
+
+    return await _streak_for_habit(ctx, habit, ctx.now().date())
+
+
+async def _streak_for_habit(
+    ctx: PlatformContext,
+    habit: Dict[str, Any],
+    today: date
+) -> int:
+    """Calculate current streak for an already fetched habit."""
+    habit_id = habit["id"]
+
+    # Every log goes through log_habit, which keeps the stored streak
+    # current, so there is nothing newer in habit_logs to account for
+    if "last_completed_date" in habit:
+        return stored_streak(habit, today)
+
+    # Daily streaks only need one row per completion day
+    if habit.get("frequency") == "daily":
+        dates = await ctx.storage.distinct_dates(
+            "habit_logs",
+            "completed_at",
+            where={"habit_id": habit_id}
+        )
+        return streak_from_dates(dates, today)
+
+    logs = await ctx.storage.query(
+        "habit_logs",
+        where={"habit_id": habit_id},
+        order_by={"completed_at": "desc"}
+    )
+
+    return streak_from_logs(habit, logs, today)
+
+
 async def get_stats(
     ctx: PlatformContext,
     period: str = "week"
@@ -321,20 +584,19 @@ async def get_stats(
     else:
         start_date = now - timedelta(days=7)
 
-    # Get logs in period
-    all_logs = []
-    for habit in habits:
-        logs = await ctx.storage.query(
+    start_iso = start_date.isoformat()
+    today_iso = now.date().isoformat()
+
+    # Get only the period's logs for all active habits in one query
+    period_logs = []
+    if habits:
+        period_logs = await ctx.storage.query(
             "habit_logs",
-            where={"habit_id": habit["id"]}
+            where={
+                "habit_id__in": [habit["id"] for habit in habits],
+                "completed_at__gte": start_iso
+            }
         )
-        all_logs.extend(logs)
-
-    # Filter logs by date
-    period_logs = [
-        log for log in all_logs
-        if datetime.fromisoformat(log["completed_at"]) >= start_date
-    ]
 
     # Calculate stats
     total_habits = len(habits)
@@ -350,12 +612,13 @@ async def get_stats(
         else 0
     )
 
-    # Completed today
-    today_logs = [
-        log for log in all_logs
-        if datetime.fromisoformat(log["completed_at"]).date() == now.date()
-    ]
-    completed_today = len(set(log["habit_id"] for log in today_logs))
+    # Completed today (today falls inside every period); ISO-8601 dates
+    # compare as plain strings, so no parsing is needed
+    today_habits = set()
+    for log in period_logs:
+        if log["completed_at"].startswith(today_iso):
+            today_habits.add(log["habit_id"])
+    completed_today = len(today_habits)
 
     stats = {
         "period": period,
@@ -364,7 +627,7 @@ async def get_stats(
         "completion_rate": round(completion_rate, 1),
         "completed_today": completed_today,
         "pending_today": total_habits - completed_today,
-        "start_date": start_date.isoformat(),
+        "start_date": start_iso,
         "end_date": now.isoformat()
     }
 
@@ -412,19 +675,24 @@ async def get_output_daily_streaks(ctx: PlatformContext) -> List[Dict[str, Any]]
     """
     habits = await get_habits(ctx, include_archived=False)
 
+    # The last completion is stored on the habit; only habits logged before
+    # that need their logs, fetched in one batched query
+    legacy_ids = [
+        habit["id"] for habit in habits if "last_completed_at" not in habit
+    ]
+    logs_by_habit = await get_logs_by_habit(ctx, legacy_ids)
+
     streaks = []
     for habit in habits:
-        streak = await calculate_streak(ctx, habit["id"])
+        # get_habits already attached the streak
+        streak = habit["current_streak"]
 
         # Get last completed date
-        logs = await ctx.storage.query(
-            "habit_logs",
-            where={"habit_id": habit["id"]},
-            order_by={"completed_at": "desc"},
-            limit=1
-        )
-
-        last_completed = logs[0]["completed_at"] if logs else None
+        if "last_completed_at" in habit:
+            last_completed = habit["last_completed_at"]
+        else:
+            logs = logs_by_habit.get(habit["id"])
+            last_completed = logs[0]["completed_at"] if logs else None
 
         streaks.append({
             "habit_id": habit["id"],
@@ -493,7 +761,16 @@ async def initialize_app(ctx: PlatformContext):
         }
     ]
 
-    for sample in sample_habits:
-        await create_habit(ctx, **sample)
+    # Insert all samples with one statement and one commit
+    habits = await ctx.storage.insert_many(
+        "habits",
+        [_new_habit_record(**sample) for sample in sample_habits]
+    )
+
+    for habit in habits:
+        await ctx.streams.publish("habit_created", {
+            "habit_id": habit["id"],
+            "habit_name": habit["name"]
+        })
 
-    logger.info(f"[HABIT TRACKER] Created {len(sample_habits)} sample habits")
+    logger.info(f"[HABIT TRACKER] Created {len(habits)} sample habits")
@@ -5,33 +5,392 @@ Hybrid approach:
 - Frontend: WebTorrent P2P (browser-to-browser)
 - Backend: libtorrent proxy (for desktop seeders)
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 import logging
 from .libtorrent_shim import lt
 import os
+import sys
+import tempfile
 import base64
 import asyncio
+import functools
+import itertools
 import httpx
+import orjson
+from collections import OrderedDict
 from pathlib import Path
 
 from app.core.platform_context import PlatformContext
 
 logger = logging.getLogger(__name__)
 
+# Video extensions playable directly in an HTML5 video element
+DIRECT_PLAY_EXTENSIONS = ('.mp4', '.webm', '.ogg', '.mov', '.m4v')
+# Video extensions that can be remuxed on-the-fly to MP4
+REMUXABLE_EXTENSIONS = ('.mkv', '.avi')
+# Both of the above
+PLAYABLE_EXTENSIONS = DIRECT_PLAY_EXTENSIONS + REMUXABLE_EXTENSIONS
+# Video extensions not supported even with remuxing
+NON_PLAYABLE_VIDEO_EXTENSIONS = ('.flv', '.wmv')
+
+# Dot-less lookup sets for _file_ext() results
+_PLAYABLE_EXT_SET = frozenset(ext[1:] for ext in PLAYABLE_EXTENSIONS)
+_NON_PLAYABLE_EXT_SET = frozenset(ext[1:] for ext in NON_PLAYABLE_VIDEO_EXTENSIONS)
+# Containers the browser can't play directly (served via the remux endpoint)
+_NEEDS_REMUX_EXT_SET = frozenset(('mkv', 'avi', 'flv', 'wmv'))
+
+# Byte sizes for formatting search results
+_GB = 1 << 30
+_MB = 1 << 20
+
+# Only the first few pieces of a window get a piece deadline; once those are
+# in flight libtorrent fills the pipe with the next prioritized pieces anyway
+DEADLINE_PIECES = 4
+
+# Raw .torrent files keyed by info hash, so re-adds skip the magnet metadata fetch
+TORRENT_CACHE_DIR = Path("./backend/uploads/torrents/_cache")
+
+def _reannounce_flags():
+    """Combine the reannounce flags this libtorrent build supports (None if none)."""
+    flags_t = getattr(lt, 'reannounce_flags_t', None)
+    flags = None
+    for name in ('ignore_min_interval', 'high_priority'):
+        flag = getattr(flags_t, name, None)
+        if flag is not None:
+            flags = flag if flags is None else flags | flag
+    return flags
+
+
+_REANNOUNCE_FLAGS = _reannounce_flags()
+
+# Probed once instead of guarding every set_piece_deadline call with try/except
+_HAS_DEADLINE = hasattr(getattr(lt, 'torrent_handle', None), 'set_piece_deadline')
+
 # Global libtorrent session (shared across all users)
 _lt_session = None
 _active_torrents = {}  # {info_hash: torrent_handle}
 
+# Per-torrent file layout as parallel tuples, computed once when metadata is available
+_file_meta: Dict[str, Dict[str, Any]] = {}  # {info_hash: {"offsets": (...), "sizes": (...), ...}}
+
+# Latest torrent_status per torrent, fed by state_update_alert
+_status_cache: Dict[str, Any] = {}  # {info_hash: torrent_status}
+_alert_task: Optional[asyncio.Task] = None
+STATUS_UPDATE_INTERVAL = 0.5  # seconds between post_torrent_updates() calls
+
+# Torrents queued with async_add_torrent, resolved by add_torrent_alert
+_pending_adds: Dict[str, asyncio.Future] = {}  # {info_hash: Future[torrent_handle]}
+ADD_TORRENT_TIMEOUT = 30.0
+
+# Set by metadata_received_alert for torrents added from a magnet link
+_metadata_events: Dict[str, asyncio.Event] = {}  # {info_hash: Event}
+METADATA_TIMEOUT = 5.0
+
+# Piece data delivered by read_piece_alert (deadlines set with alert_when_available),
+# so streams can serve fresh pieces without waiting for the disk round-trip
+_piece_cache: "OrderedDict[tuple, bytes]" = OrderedDict()  # {(info_hash, piece): data}, LRU order
+_piece_cache_bytes = 0
+PIECE_CACHE_MAX_BYTES = 128 * 1024 * 1024
+
+# Stream readers waiting for a piece's data, resolved by read_piece_alert
+_piece_waiters: Dict[tuple, List[asyncio.Future]] = {}  # {(info_hash, piece): [Future[bytes | None]]}
+
+# Shared HTTP client for torrent/subtitle searches (keeps TLS connections alive)
+_http_client: Optional[httpx.AsyncClient] = None
+
 def get_lt_session():
     """Get or create libtorrent session."""
     global _lt_session
     if _lt_session is None:
-        _lt_session = lt.session({'listen_interfaces': '0.0.0.0:6881'})
+        _lt_session = lt.session({
+            'listen_interfaces': '0.0.0.0:6881',
+            # One session serves every user's torrents; raise the defaults that
+            # throttle many concurrent streaming torrents
+            'connection_speed': 500,  # outgoing connection attempts per second
+            'torrent_connect_boost': 50,  # peers connected right away for a newly added torrent
+            'active_limit': 500,
+            'active_downloads': 100,
+            'active_seeds': 100,
+            'aio_threads': 8,  # disk I/O threads
+            'max_queued_disk_bytes': 32 * 1024 * 1024,
+            'send_buffer_watermark': 5_000_000,
+            'suggest_mode': lt.suggest_mode_t.suggest_read_cache,
+            # status_notification is needed for metadata_received_alert,
+            # storage_notification for read_piece_alert,
+            # piece_progress_notification for piece_finished_alert
+            'alert_mask': (
+                lt.alert.category_t.error_notification
+                | lt.alert.category_t.status_notification
+                | lt.alert.category_t.storage_notification
+                | lt.alert.category_t.piece_progress_notification
+            ),
+        })
         logger.info("[TORRENT PROXY] libtorrent session created")
+    _ensure_alert_pump(_lt_session)
     return _lt_session
 
 
+def _ensure_alert_pump(ses):
+    """Start the alert pump on the running event loop if it isn't already running."""
+    global _alert_task
+    if _alert_task is not None and not _alert_task.done():
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    _alert_task = loop.create_task(_alert_pump(ses))
+
+
+async def _alert_pump(ses):
+    """
+    Drain libtorrent alerts in the background for the lifetime of the process.
+
+    Torrent status is requested for all torrents at once via
+    post_torrent_updates(), so request handlers never take the session lock
+    for handle.status().
+    """
+    loop = asyncio.get_running_loop()
+    next_update = 0.0
+    while True:
+        try:
+            # Blocks in a worker thread (GIL released) until an alert arrives
+            await asyncio.to_thread(ses.wait_for_alert, int(STATUS_UPDATE_INTERVAL * 1000))
+            now = loop.time()
+            if now >= next_update:
+                ses.post_torrent_updates()
+                next_update = now + STATUS_UPDATE_INTERVAL
+            for alert in ses.pop_alerts():
+                _dispatch_alert(alert)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"[TORRENT PROXY] Alert pump error: {e}")
+            await asyncio.sleep(STATUS_UPDATE_INTERVAL)
+
+
+def _dispatch_alert(alert):
+    """Route a single libtorrent alert to the module-level caches."""
+    if isinstance(alert, lt.state_update_alert):
+        for st in alert.status:
+            _status_cache[str(st.info_hash)] = st
+    elif isinstance(alert, lt.add_torrent_alert):
+        params = alert.params
+        ti = params.ti
+        info_hash = str(ti.info_hash() if ti is not None else params.info_hash)
+        if ti is not None:
+            # Added with metadata: no metadata_received_alert will follow
+            event = _metadata_events.pop(info_hash, None)
+            if event is not None:
+                event.set()
+        future = _pending_adds.pop(info_hash, None)
+        if future is None or future.done():
+            return
+        # Duplicate adds report an error but still carry the existing, valid handle
+        if alert.handle.is_valid():
+            if not alert.error.value():
+                _announce_new_torrent(alert.handle)
+            future.set_result(alert.handle)
+        else:
+            future.set_exception(RuntimeError(alert.error.message()))
+    elif isinstance(alert, lt.read_piece_alert):
+        info_hash = str(alert.handle.info_hash())
+        data = None
+        if not alert.error.value() and alert.size > 0:
+            data = bytes(alert.buffer)
+            _cache_piece(info_hash, alert.piece, data)
+        for future in _piece_waiters.pop((info_hash, alert.piece), ()):
+            if not future.done():
+                future.set_result(data)
+    elif isinstance(alert, lt.piece_finished_alert):
+        # Someone is waiting on this piece: have libtorrent post its data
+        if (str(alert.handle.info_hash()), alert.piece_index) in _piece_waiters:
+            alert.handle.read_piece(alert.piece_index)
+    elif isinstance(alert, lt.metadata_received_alert):
+        event = _metadata_events.pop(str(alert.handle.info_hash()), None)
+        if event is not None:
+            event.set()
+
+
+def _announce_new_torrent(handle):
+    """Announce a freshly added torrent once, ahead of the tracker queue where supported."""
+    try:
+        if _REANNOUNCE_FLAGS is not None:
+            handle.force_reannounce(0, -1, _REANNOUNCE_FLAGS)
+        else:
+            handle.force_reannounce()
+    except Exception as e:
+        logger.warning(f"[TORRENT PROXY] Initial announce failed: {e}")
+
+
+def _cache_piece(info_hash: str, piece: int, data: bytes):
+    """Store piece data, evicting least recently used pieces over PIECE_CACHE_MAX_BYTES."""
+    global _piece_cache_bytes
+    key = (info_hash, piece)
+    old = _piece_cache.pop(key, None)
+    if old is not None:
+        _piece_cache_bytes -= len(old)
+    _piece_cache[key] = data
+    _piece_cache_bytes += len(data)
+    while _piece_cache_bytes > PIECE_CACHE_MAX_BYTES and _piece_cache:
+        _, evicted = _piece_cache.popitem(last=False)
+        _piece_cache_bytes -= len(evicted)
+
+
+def get_cached_piece(info_hash: str, piece: int) -> Optional[bytes]:
+    """Get piece data posted by libtorrent, or None (caller falls back to reading the file)."""
+    key = (info_hash, piece)
+    data = _piece_cache.get(key)
+    if data is not None:
+        _piece_cache.move_to_end(key)
+    return data
+
+
+def add_piece_waiter(info_hash: str, piece: int) -> asyncio.Future:
+    """
+    Register a future resolved with a piece's data by the alert pump.
+
+    The future resolves when the piece's read_piece_alert arrives (None on a
+    read error). Finished pieces are read automatically; for a piece that is
+    already downloaded the caller must call handle.read_piece() itself.
+    """
+    future = asyncio.get_running_loop().create_future()
+    _piece_waiters.setdefault((info_hash, piece), []).append(future)
+    return future
+
+
+def discard_piece_waiter(info_hash: str, piece: int, future: asyncio.Future):
+    """Unregister a piece future that is no longer awaited (e.g. after a timeout)."""
+    key = (info_hash, piece)
+    waiters = _piece_waiters.get(key)
+    if waiters and future in waiters:
+        waiters.remove(future)
+        if not waiters:
+            del _piece_waiters[key]
+
+
+def _metadata_event(info_hash: str) -> asyncio.Event:
+    """Get the metadata event for a torrent; register it before adding the torrent."""
+    return _metadata_events.setdefault(info_hash.lower(), asyncio.Event())
+
+
+async def _wait_for_metadata(handle, event: asyncio.Event) -> bool:
+    """Wait up to METADATA_TIMEOUT for metadata_received_alert; returns has_metadata()."""
+    if not handle.has_metadata():
+        try:
+            await asyncio.wait_for(event.wait(), timeout=METADATA_TIMEOUT)
+        except asyncio.TimeoutError:
+            pass
+    return handle.has_metadata()
+
+
+async def _add_torrent(ses, atp, info_hash: str):
+    """
+    Add a torrent without blocking the event loop.
+
+    Queues the add with async_add_torrent and waits for the matching
+    add_torrent_alert from the alert pump. Concurrent adds of the same
+    torrent share one future.
+    """
+    info_hash = info_hash.lower()  # alerts report lowercase hex
+    future = _pending_adds.get(info_hash)
+    if future is None:
+        future = asyncio.get_running_loop().create_future()
+        _pending_adds[info_hash] = future
+        ses.async_add_torrent(atp)
+    try:
+        return await asyncio.wait_for(asyncio.shield(future), timeout=ADD_TORRENT_TIMEOUT)
+    except asyncio.TimeoutError:
+        _pending_adds.pop(info_hash, None)
+        raise ValueError(f"Timed out adding torrent {info_hash}")
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get or create the shared pooled HTTP client."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=10.0,
+            follow_redirects=True,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+        )
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared HTTP client (called on application shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def _file_ext(path: str) -> str:
+    """Lowercased extension without the dot (lowercases only the suffix, not the whole path)."""
+    return path.rpartition('.')[2].lower()
+
+
+def _build_file_meta(torrent_info) -> Dict[str, Any]:
+    """Read the file layout out of libtorrent once into parallel tuples."""
+    fs = torrent_info.files()
+    piece_length = torrent_info.piece_length()
+    file_range = range(torrent_info.num_files())
+    paths = tuple(fs.file_path(i) for i in file_range)
+    offsets = tuple(fs.file_offset(i) for i in file_range)
+    sizes = tuple(fs.file_size(i) for i in file_range)
+    return {
+        "piece_length": piece_length,
+        "num_pieces": torrent_info.num_pieces(),
+        "paths": paths,
+        "offsets": offsets,
+        "sizes": sizes,
+        "first_pieces": tuple(offset // piece_length for offset in offsets),
+        "last_pieces": tuple((offset + size - 1) // piece_length for offset, size in zip(offsets, sizes)),
+        "playable": tuple(_file_ext(path) in _PLAYABLE_EXT_SET for path in paths),
+    }
+
+
+def _get_file_meta(info_hash: str, handle) -> Dict[str, Any]:
+    """Get the cached file layout for a torrent, building it on first use."""
+    meta = _file_meta.get(info_hash)
+    if meta is None:
+        meta = _file_meta[info_hash] = _build_file_meta(handle.torrent_file())
+    return meta
+
+
+@functools.lru_cache(maxsize=4096)
+def _ensure_dir(user_id: str, info_hash: str) -> Path:
+    """Create a user's download directory for a torrent (once per process)."""
+    download_dir = Path(f"./backend/uploads/torrents/{user_id}/{info_hash}")
+    download_dir.mkdir(parents=True, exist_ok=True)
+    return download_dir
+
+
+def _cached_torrent_path(info_hash: str) -> Path:
+    """Path of the cached .torrent file for an info hash."""
+    return TORRENT_CACHE_DIR / f"{info_hash.lower()}.torrent"
+
+
+def _write_torrent_cache(info_hash: str, torrent_bytes: bytes):
+    """Persist .torrent bytes to the cache (atomic rename, skipped if present)."""
+    path = _cached_torrent_path(info_hash)
+    if path.exists():
+        return
+    TORRENT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # Unique temp name: concurrent adds of the same torrent must not share one
+    tmp = tempfile.NamedTemporaryFile(
+        dir=TORRENT_CACHE_DIR, prefix=path.stem, suffix=".tmp", delete=False
+    )
+    try:
+        with tmp:
+            tmp.write(torrent_bytes)
+        os.replace(tmp.name, path)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
+
+
 async def save_torrent_info(
     ctx: PlatformContext,
     name: str,
@@ -157,19 +516,24 @@ async def start_backend_download(
     try:
         ses = get_lt_session()
 
-        # Decode torrent data
-        torrent_bytes = base64.b64decode(torrent_data)
+        # Decode and parse off the event loop (large torrents take tens of ms)
+        torrent_bytes = await asyncio.to_thread(base64.b64decode, torrent_data)
 
         # Parse torrent to get info_hash and metadata
-        torrent_info = lt.torrent_info(torrent_bytes)
-        info_hash = str(torrent_info.info_hash())
+        torrent_info = await asyncio.to_thread(lt.torrent_info, torrent_bytes)
+        info_hash = sys.intern(str(torrent_info.info_hash()))
         torrent_name = torrent_info.name()
         file_count = torrent_info.num_files()
         total_size = torrent_info.total_size()
 
+        # Keep the .torrent so a later rehydration doesn't need peers for metadata
+        try:
+            await asyncio.to_thread(_write_torrent_cache, info_hash, torrent_bytes)
+        except OSError as e:
+            logger.warning(f"[TORRENT PROXY] Failed to cache .torrent for {info_hash}: {e}")
+
         # Create download directory
-        download_dir = Path(f"./backend/uploads/torrents/{ctx.user_id}/{info_hash}")
-        download_dir.mkdir(parents=True, exist_ok=True)
+        download_dir = await asyncio.to_thread(_ensure_dir, ctx.user_id, info_hash)
 
         # Add torrent
         atp = lt.add_torrent_params()
@@ -181,67 +545,59 @@ async def start_backend_download(
         # The file will be the correct size immediately, and pieces are written as downloaded
         atp.storage_mode = lt.storage_mode_t.storage_mode_allocate
 
-        handle = ses.add_torrent(atp)
+        handle = await _add_torrent(ses, atp, info_hash)
         _active_torrents[info_hash] = handle
 
-        # Enable sequential download immediately for streaming
-        handle.set_sequential_download(True)
+        # No sequential mode: the header/tail piece deadlines below drive the order
 
         # SMART: Prioritize all playable video files (including remuxable formats)
-        # These formats can be played directly in HTML5 video element
-        direct_play_extensions = ['.mp4', '.webm', '.ogg', '.mov', '.m4v']
-        # These formats can be remuxed on-the-fly to MP4
-        remuxable_extensions = ['.mkv', '.avi']
-        # Combine both for prioritization
-        playable_extensions = direct_play_extensions + remuxable_extensions
-        # These formats are not supported even with remuxing
-        non_playable_video = ['.flv', '.wmv']
+        meta = _file_meta[info_hash] = _build_file_meta(torrent_info)
+        piece_length = meta["piece_length"]
+        num_pieces = meta["num_pieces"]
+        paths, playable = meta["paths"], meta["playable"]
 
-        piece_length = torrent_info.piece_length()
+        # (piece, priority) pairs applied in one call after the loop; pairs leave
+        # every other piece alone, so re-adding a torrent that is already
+        # downloading keeps the priorities its streams have set
+        piece_priorities = []
+        urgent_pieces = []
 
-        for i in range(torrent_info.num_files()):
-            file_entry = torrent_info.files().at(i)
-            file_name = file_entry.path.lower()
+        for i in range(file_count):
+            file_path = paths[i]
 
             # Only auto-prioritize if it's a PLAYABLE video file
-            if any(file_name.endswith(ext) for ext in playable_extensions):
-                file_offset = file_entry.offset
-                file_size = file_entry.size
-                first_piece = file_offset // piece_length
-                last_piece = (file_offset + file_size - 1) // piece_length
+            if playable[i]:
+                file_offset = meta["offsets"][i]
+                file_size = meta["sizes"][i]
+                first_piece = meta["first_pieces"][i]
+                last_piece = meta["last_pieces"][i]
 
                 # Prioritize first 2MB and last 5MB of EACH video file
                 # First 2MB (header)
                 header_bytes = min(file_size, 2 * 1024 * 1024)
                 header_end_piece = (file_offset + header_bytes - 1) // piece_length
-                for p in range(first_piece, min(header_end_piece + 1, torrent_info.num_pieces())):
-                    handle.piece_priority(p, 7)
-                    try:
-                        handle.set_piece_deadline(p, 0, 1)  # IMMEDIATE with alert
-                    except:
-                        pass
+                header_pieces = range(first_piece, min(header_end_piece + 1, num_pieces))
+                piece_priorities.extend((p, 7) for p in header_pieces)
+                urgent_pieces.extend(header_pieces[:DEADLINE_PIECES])
 
                 # Last 5MB (moov atom for MP4)
                 if file_size > 10 * 1024 * 1024:
                     tail_bytes = min(file_size, 5 * 1024 * 1024)
                     tail_start = (file_offset + file_size - tail_bytes) // piece_length
-                    for p in range(tail_start, last_piece + 1):
-                        handle.piece_priority(p, 7)
-                        try:
-                            handle.set_piece_deadline(p, 0, 1)  # IMMEDIATE
-                        except:
-                            pass
-
-                logger.info(f"[TORRENT] Pre-prioritized PLAYABLE video {i}: {file_entry.path} (pieces {first_piece}-{header_end_piece} + tail)")
-            elif any(file_name.endswith(ext) for ext in non_playable_video):
-                logger.info(f"[TORRENT] Skipping non-playable video {i}: {file_entry.path} (requires transcoding)")
-
-        # Force announce to get peers immediately
-        try:
-            handle.force_reannounce()
-            handle.force_dht_announce()
-        except:
-            pass
+                    tail_pieces = range(tail_start, last_piece + 1)
+                    piece_priorities.extend((p, 7) for p in tail_pieces)
+                    urgent_pieces.extend(tail_pieces[:DEADLINE_PIECES])
+
+                logger.info(f"[TORRENT] Pre-prioritized PLAYABLE video {i}: {file_path} (pieces {first_piece}-{header_end_piece} + tail)")
+            elif _file_ext(file_path) in _NON_PLAYABLE_EXT_SET:
+                logger.info(f"[TORRENT] Skipping non-playable video {i}: {file_path} (requires transcoding)")
+
+        # One call sets the header/tail priorities under a single libtorrent lock
+        if urgent_pieces:
+            handle.prioritize_pieces(piece_priorities)
+            if _HAS_DEADLINE:
+                for p in urgent_pieces:
+                    handle.set_piece_deadline(p, 0, 1)  # IMMEDIATE with alert
 
         logger.info(f"[TORRENT PROXY] Started download with video pre-prioritization: {torrent_name} ({info_hash})")
 
@@ -275,14 +631,17 @@ async def get_download_status(
         Download status and progress
     """
     try:
-        if info_hash not in _active_torrents:
+        handle = _active_torrents.get(info_hash)
+        if handle is None:
             return {
                 "success": False,
                 "error": "Torrent not found in active downloads"
             }
 
-        handle = _active_torrents[info_hash]
-        status = handle.status()
+        # Read the alert-fed cache; only query libtorrent before the first update
+        status = _status_cache.get(info_hash)
+        if status is None:
+            status = handle.status()
 
         return {
             "success": True,
@@ -320,64 +679,62 @@ async def list_torrent_files(
         List of files
     """
     try:
-        if info_hash not in _active_torrents:
-            # Attempt to rehydrate torrent from info_hash using a minimal magnet link
-            logger.info(f"[TORRENT PROXY] Torrent {info_hash} not active; attempting re-add via magnet")
+        handle = _active_torrents.get(info_hash)
+        if handle is None:
+            # Attempt to rehydrate torrent from the cached .torrent, else a minimal magnet link
             ses = get_lt_session()
             # Create download directory first
-            download_dir = Path(f"./backend/uploads/torrents/{ctx.user_id}/{info_hash}")
-            download_dir.mkdir(parents=True, exist_ok=True)
+            download_dir = _ensure_dir(ctx.user_id, info_hash)
             try:
-                atp = lt.parse_magnet_uri(f"magnet:?xt=urn:btih:{info_hash}")
+                cached_torrent = _cached_torrent_path(info_hash)
+                if cached_torrent.exists():
+                    logger.info(f"[TORRENT PROXY] Torrent {info_hash} not active; re-adding from cached .torrent")
+                    atp = lt.add_torrent_params()
+                    atp.ti = await asyncio.to_thread(lt.torrent_info, str(cached_torrent))
+                else:
+                    logger.info(f"[TORRENT PROXY] Torrent {info_hash} not active; attempting re-add via magnet")
+                    atp = lt.parse_magnet_uri(f"magnet:?xt=urn:btih:{info_hash}")
                 atp.save_path = str(download_dir)
                 atp.storage_mode = lt.storage_mode_t.storage_mode_allocate
-                handle = ses.add_torrent(atp)
-                handle.set_sequential_download(True)
-                _active_torrents[info_hash] = handle
-                # Wait briefly for metadata
-                for _ in range(50):
-                    if handle.has_metadata():
-                        break
-                    await asyncio.sleep(0.1)
+                metadata_event = _metadata_event(info_hash)
+                handle = await _add_torrent(ses, atp, info_hash)
+                _active_torrents[sys.intern(info_hash)] = handle
+                # Wait briefly for metadata (already present when added from cache)
+                await _wait_for_metadata(handle, metadata_event)
             except Exception as e:
                 logger.error(f"[TORRENT PROXY] Re-add via magnet failed: {e}")
                 raise ValueError("Torrent not found")
 
-        handle = _active_torrents[info_hash]
-        torrent_info = handle.torrent_file()
-
         # When listing files, prioritize all playable formats (including remuxable)
-        playable_extensions = ['.mp4', '.webm', '.ogg', '.mov', '.m4v', '.mkv', '.avi']
-        piece_length = torrent_info.piece_length()
+        meta = _get_file_meta(info_hash, handle)
+        piece_length = meta["piece_length"]
+        num_pieces = meta["num_pieces"]
+        file_progress = handle.file_progress()
 
         files = []
-        for i in range(torrent_info.num_files()):
-            file_entry = torrent_info.files().at(i)
-            file_name = file_entry.path.lower()
-
+        for i, (file_path, file_size) in enumerate(zip(meta["paths"], meta["sizes"])):
             # Only prioritize if it's a PLAYABLE video file
-            if any(file_name.endswith(ext) for ext in playable_extensions):
-                file_offset = file_entry.offset
-                file_size = file_entry.size
-                first_piece = file_offset // piece_length
+            if meta["playable"][i]:
+                file_offset = meta["offsets"][i]
+                first_piece = meta["first_pieces"][i]
 
                 # Prioritize at least first 5MB
                 header_bytes = min(file_size, 5 * 1024 * 1024)
                 header_end_piece = (file_offset + header_bytes - 1) // piece_length
 
-                for p in range(first_piece, min(header_end_piece + 1, torrent_info.num_pieces())):
-                    if not handle.have_piece(p):
-                        handle.piece_priority(p, 7)
-                        try:
+                missing = [p for p in range(first_piece, min(header_end_piece + 1, num_pieces))
+                           if not handle.have_piece(p)]
+                if missing:
+                    handle.prioritize_pieces([(p, 7) for p in missing])
+                    if _HAS_DEADLINE:
+                        for p in missing[:DEADLINE_PIECES]:
                             handle.set_piece_deadline(p, 0, 1)
-                        except:
-                            pass
 
             files.append({
                 "index": i,
-                "name": file_entry.path,
-                "size": file_entry.size,
-                "progress": handle.file_progress()[i] / file_entry.size * 100 if file_entry.size > 0 else 0
+                "name": file_path,
+                "size": file_size,
+                "progress": file_progress[i] / file_size * 100 if file_size > 0 else 0
             })
 
         return files
@@ -404,31 +761,30 @@ async def get_stream_url(
         Streaming URL with signed token
     """
     try:
-        if info_hash not in _active_torrents:
+        handle = _active_torrents.get(info_hash)
+        if handle is None:
             raise ValueError("Torrent not found")
 
-        handle = _active_torrents[info_hash]
-        torrent_info = handle.torrent_file()
+        meta = _get_file_meta(info_hash, handle)
 
-        if file_index >= torrent_info.num_files():
+        if file_index >= len(meta["paths"]):
             raise ValueError("Invalid file index")
 
-        file_entry = torrent_info.files().at(file_index)
-
-        # Prioritize this file
-        handle.file_priority(file_index, 7)  # High priority
+        file_path_in_torrent = meta["paths"][file_index]
+        file_offset = meta["offsets"][file_index]
+        file_size = meta["sizes"][file_index]
+        num_pieces = meta["num_pieces"]
 
-        # Enable sequential download for this torrent (downloads pieces in order)
-        # This ensures the beginning of the file is downloaded first for streaming
-        handle.set_sequential_download(True)
+        # Piece deadlines drive the download order here. Per libtorrent's
+        # author, sequential download and piece/file priorities conflict with
+        # deadlines, so no set_sequential_download or blanket file_priority,
+        # and piece priorities only stand in when deadlines are unavailable.
 
         # MAXIMUM AGGRESSIVE prioritization for INSTANT streaming
         try:
-            piece_length = torrent_info.piece_length()
-            file_offset = file_entry.offset
-            file_size = file_entry.size
-            first_piece = file_offset // piece_length
-            last_piece = (file_offset + file_size - 1) // piece_length
+            piece_length = meta["piece_length"]
+            first_piece = meta["first_pieces"][file_index]
+            last_piece = meta["last_pieces"][file_index]
 
             # CRITICAL: Download header AND tail FIRST (for MP4/MKV files)
 
@@ -440,63 +796,50 @@ async def get_stream_url(
             tail_bytes = min(file_size, 10 * 1024 * 1024)
             tail_start_piece = max(critical_end_piece + 1, (file_offset + file_size - tail_bytes) // piece_length)
 
-            # Set MAXIMUM priority for header pieces
-            for i in range(first_piece, min(critical_end_piece + 1, torrent_info.num_pieces())):
-                handle.piece_priority(i, 7)
-                try:
-                    handle.set_piece_deadline(i, 0, 1)  # ALERT MODE - highest urgency
-                except:
-                    pass
-
-            # Set MAXIMUM priority for tail pieces (moov atom)
-            for i in range(tail_start_piece, min(last_piece + 1, torrent_info.num_pieces())):
-                handle.piece_priority(i, 7)
-                try:
-                    handle.set_piece_deadline(i, 0, 1)  # ALERT MODE for tail too!
-                except:
-                    pass
+            header_pieces = range(first_piece, min(critical_end_piece + 1, num_pieces))
+            tail_pieces = range(tail_start_piece, min(last_piece + 1, num_pieces))
 
             # 3. Next 20MB after header gets high priority for buffering
             buffer_bytes = min(file_size, 22 * 1024 * 1024)
             buffer_end_piece = (file_offset + buffer_bytes - 1) // piece_length
-            for i in range(critical_end_piece + 1, min(buffer_end_piece + 1, tail_start_piece)):
-                handle.piece_priority(i, 7)
-                try:
-                    handle.set_piece_deadline(i, 100, 0)
-                except:
-                    pass
+            buffer_pieces = range(critical_end_piece + 1, min(buffer_end_piece + 1, tail_start_piece))
+
+            # Deadlines only on the pieces the player needs first. Flag 1 is
+            # alert_when_available: libtorrent posts each piece as a read_piece_alert,
+            # which the alert pump puts in _piece_cache (see get_cached_piece)
+            if _HAS_DEADLINE:
+                for i in (*header_pieces[:DEADLINE_PIECES], *tail_pieces[:DEADLINE_PIECES]):
+                    handle.set_piece_deadline(i, 0, 1)  # ALERT MODE - highest urgency
+
+                # Forward buffer: deadlines staggered by distance from the file start
+                for i in buffer_pieces:
+                    handle.set_piece_deadline(i, (i - first_piece) * 100, 0)
+            else:
+                # No deadline support: MAXIMUM priority for header, tail (moov
+                # atom) and buffer in one call instead
+                handle.prioritize_pieces(
+                    [(i, 7) for i in header_pieces]
+                    + [(i, 7) for i in tail_pieces]
+                    + [(i, 7) for i in buffer_pieces]
+                )
 
             # 4. Aggressive connection settings
             handle.set_max_connections(500)  # Maximum connections
             handle.set_max_uploads(-1)  # Unlimited uploads
 
-            # 5. Force multiple announces
-            try:
-                handle.force_reannounce()
-                handle.force_dht_announce()
-                handle.scrape_tracker()  # Also scrape for more peers
-            except:
-                pass
-
-            logger.info(f"[TORRENT] MAXIMUM priority: header {first_piece}-{critical_end_piece}, tail {tail_start_piece}-{last_piece}")
+            logger.info(f"[TORRENT] Prioritized header {first_piece}-{critical_end_piece}, tail {tail_start_piece}-{last_piece}")
         except Exception as e:
             logger.warning(f"[TORRENT PROXY] Failed to prioritize header/tail pieces: {e}")
 
-        logger.info(f"[TORRENT PROXY] Enabled sequential download for {info_hash}")
-
-        # Get file path
-        download_dir = Path(f"./backend/uploads/torrents/{ctx.user_id}/{info_hash}")
-        file_path = download_dir / file_entry.path
-
         # Generate signed token for streaming
         from app.api.v1.apps import generate_stream_token
         token = generate_stream_token(ctx.user_id, info_hash, file_index)
 
         # Choose the right streaming endpoint based on file format
-        file_ext = file_entry.path.lower().split('.')[-1] if '.' in file_entry.path else ''
+        file_ext = _file_ext(file_path_in_torrent)
 
         # MKV, AVI, FLV, WMV need remuxing to work in browsers
-        needs_remux = file_ext in ['mkv', 'avi', 'flv', 'wmv']
+        needs_remux = file_ext in _NEEDS_REMUX_EXT_SET
 
         if needs_remux:
             # Use remux endpoint for formats that need container conversion
@@ -509,8 +852,8 @@ async def get_stream_url(
         return {
             "success": True,
             "stream_url": stream_url,
-            "file_name": file_entry.path,
-            "file_size": file_entry.size
+            "file_name": file_path_in_torrent,
+            "file_size": file_size
         }
 
     except Exception as e:
@@ -537,19 +880,19 @@ async def set_piece_priority(
         Success status
     """
     try:
-        if info_hash not in _active_torrents:
+        handle = _active_torrents.get(info_hash)
+        if handle is None:
             raise ValueError("Torrent not found")
 
-        handle = _active_torrents[info_hash]
-        torrent_info = handle.torrent_file()
+        meta = _get_file_meta(info_hash, handle)
 
-        if file_index >= torrent_info.num_files():
+        if file_index >= len(meta["offsets"]):
             raise ValueError("Invalid file index")
 
         # Get file info
-        file_entry = torrent_info.files().at(file_index)
-        file_offset = file_entry.offset
-        piece_length = torrent_info.piece_length()
+        file_offset = meta["offsets"][file_index]
+        piece_length = meta["piece_length"]
+        num_pieces = meta["num_pieces"]
 
         # Calculate which piece corresponds to this byte offset
         absolute_offset = file_offset + byte_offset
@@ -560,13 +903,10 @@ async def set_piece_priority(
 
         logger.info(f"[TORRENT PROXY] Prioritizing pieces starting from {piece_index} for seek to {byte_offset}")
 
-        # Set high priority for pieces around the seek position
-        for i in range(max(0, piece_index - 2), min(torrent_info.num_pieces(), piece_index + buffer_pieces)):
-            handle.piece_priority(i, 7)  # High priority
-
-        # Set immediate priority for the exact piece we need
-        if piece_index < torrent_info.num_pieces():
-            handle.piece_priority(piece_index, 7)  # Immediate priority
+        # Set high priority for pieces around the seek position (includes the exact piece we need)
+        handle.prioritize_pieces(
+            [(i, 7) for i in range(max(0, piece_index - 2), min(num_pieces, piece_index + buffer_pieces))]
+        )
 
         return {
             "success": True,
@@ -585,41 +925,40 @@ async def seek_prefetch(
     window_bytes: int = 256 * 1024 * 1024  # 256MB window for seeks
 ) -> Dict[str, Any]:
     try:
-        if info_hash not in _active_torrents:
+        handle = _active_torrents.get(info_hash)
+        if handle is None:
             raise ValueError("Torrent not found")
 
-        handle = _active_torrents[info_hash]
-        torrent_info = handle.torrent_file()
+        meta = _get_file_meta(info_hash, handle)
 
-        if file_index >= torrent_info.num_files():
+        if file_index >= len(meta["offsets"]):
             raise ValueError("Invalid file index")
 
-        file_entry = torrent_info.files().at(file_index)
-        file_offset = file_entry.offset
-        piece_length = torrent_info.piece_length()
-        file_size = file_entry.size
+        file_offset = meta["offsets"][file_index]
+        file_size = meta["sizes"][file_index]
+        piece_length = meta["piece_length"]
+        num_pieces = meta["num_pieces"]
 
         # Calculate seek position pieces
         absolute_start = file_offset + max(0, byte_offset)
         start_piece = absolute_start // piece_length
 
-        # CRITICAL: First 10 pieces at seek position MUST be downloaded immediately
+        # CRITICAL: First 10 pieces at seek position, then 50 more for smooth playback
         critical_pieces = 10
-        for i in range(start_piece, min(start_piece + critical_pieces, torrent_info.num_pieces())):
-            handle.piece_priority(i, 7)
-            try:
-                handle.set_piece_deadline(i, 0, 1)  # IMMEDIATE with ALERT mode
-            except:
-                pass
-
-        # Next 50 pieces get high priority for smooth playback
         buffer_pieces = 50
-        for i in range(start_piece + critical_pieces, min(start_piece + critical_pieces + buffer_pieces, torrent_info.num_pieces())):
-            handle.piece_priority(i, 7)
-            try:
-                handle.set_piece_deadline(i, (i - start_piece) * 100, 0)  # Staggered deadlines
-            except:
-                pass
+        end_piece = min(start_piece + critical_pieces + buffer_pieces, num_pieces)
+        priorities = [(i, 7) for i in range(start_piece, end_piece)]
+
+        # Deadlines only where immediacy matters
+        if _HAS_DEADLINE:
+            for i in range(start_piece, min(start_piece + DEADLINE_PIECES, end_piece)):
+                handle.set_piece_deadline(i, (i - start_piece) * 100, 1)  # Staggered, with ALERT
+
+        # Small files: the seek window already covers most of the file, so skip seek-point prediction
+        if file_size < 4 * window_bytes:
+            handle.prioritize_pieces(priorities)
+            logger.info(f"[TORRENT PROXY] Prefetch window pieces {start_piece}-{end_piece} for offset {byte_offset}")
+            return {"success": True, "message": "Seek prefetch scheduled"}
 
         # Also prefetch common seek points (25%, 50%, 75% of file) with lower priority
         common_seek_points = [
@@ -628,15 +967,22 @@ async def seek_prefetch(
             int(file_size * 0.75),
         ]
 
+        # Piece bitfield and priorities read once instead of per piece
+        status = _status_cache.get(info_hash) or handle.status()
+        have_pieces = status.pieces
+        current_priorities = handle.get_piece_priorities()
         for seek_point in common_seek_points:
             if abs(seek_point - byte_offset) > window_bytes:  # Don't duplicate if near current seek
                 point_start = file_offset + seek_point
                 point_piece = point_start // piece_length
                 # Prefetch 8 pieces (typically 16-32MB) at each common point
-                for j in range(point_piece, min(point_piece + 8, torrent_info.num_pieces())):
-                    current_priority = handle.piece_priority(j)
-                    if current_priority < 4:  # Only update if not already high priority
-                        handle.piece_priority(j, 4)
+                priorities.extend(
+                    (j, 4) for j in range(point_piece, min(point_piece + 8, num_pieces))
+                    # Skip downloaded pieces and ones already at high priority
+                    if not have_pieces[j] and current_priorities[j] < 4
+                )
+
+        handle.prioritize_pieces(priorities)
 
         logger.info(f"[TORRENT PROXY] Prefetch window pieces {start_piece}-{end_piece} for offset {byte_offset}, plus common seek points")
 
@@ -649,6 +995,26 @@ async def seek_prefetch(
 
 # App initialization (called on first install)
 
+def _format_search_result(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Format one apibay search result."""
+    name = item.get('name')
+    info_hash = item.get('info_hash')
+    size_bytes = int(item.get('size', 0))
+    return {
+        "id": item.get('id'),
+        "name": name,
+        "info_hash": info_hash,
+        "size": f"{size_bytes / _GB:.2f} GB" if size_bytes >= _GB else f"{size_bytes / _MB:.2f} MB",
+        "size_bytes": size_bytes,
+        "seeders": int(item.get('seeders', 0)),
+        "leechers": int(item.get('leechers', 0)),
+        "num_files": int(item.get('num_files', 0)),
+        "category": item.get('category'),
+        "added": item.get('added'),
+        "magnet": f"magnet:?xt=urn:btih:{info_hash}&dn={name}"
+    }
+
+
 async def search_torrents(
     ctx: PlatformContext,
     query: str,
@@ -680,41 +1046,20 @@ async def search_torrents(
             'Origin': 'https://apibay.org'
         }
 
-        async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
-            response = await client.get(api_url, headers=headers)
-            response.raise_for_status()
-            results = response.json()
-
-        # Filter and format results
-        torrents = []
-        for item in results[:limit]:
-            # Skip if no results (API returns [{"name": "No results returned"}])
-            if item.get('name') == 'No results returned':
-                break
-
-            # Format size from bytes
-            size_bytes = int(item.get('size', 0))
-            size_gb = size_bytes / (1024 ** 3)
-            size_mb = size_bytes / (1024 ** 2)
-
-            if size_gb >= 1:
-                size_str = f"{size_gb:.2f} GB"
-            else:
-                size_str = f"{size_mb:.2f} MB"
-
-            torrents.append({
-                "id": item.get('id'),
-                "name": item.get('name'),
-                "info_hash": item.get('info_hash'),
-                "size": size_str,
-                "size_bytes": size_bytes,
-                "seeders": int(item.get('seeders', 0)),
-                "leechers": int(item.get('leechers', 0)),
-                "num_files": int(item.get('num_files', 0)),
-                "category": item.get('category'),
-                "added": item.get('added'),
-                "magnet": f"magnet:?xt=urn:btih:{item.get('info_hash')}&dn={item.get('name')}"
-            })
+        client = get_http_client()
+        response = await client.get(api_url, headers=headers)
+        response.raise_for_status()
+        results = orjson.loads(response.content)
+
+        # Filter and format results, stopping at the no-results sentinel
+        # (API returns [{"name": "No results returned"}])
+        torrents = [
+            _format_search_result(item)
+            for item in itertools.takewhile(
+                lambda item: item.get('name') != 'No results returned',
+                results[:limit]
+            )
+        ]
 
         logger.info(f"[TORRENT SEARCH] Found {len(torrents)} results for: {query}")
 
@@ -746,11 +1091,10 @@ async def download_torrent_from_magnet(
         atp = lt.parse_magnet_uri(magnet_link)
 
         # Get info hash from magnet
-        info_hash = str(atp.info_hash)
+        info_hash = sys.intern(str(atp.info_hash))
 
         # Create download directory
-        download_dir = Path(f"./backend/uploads/torrents/{ctx.user_id}/{info_hash}")
-        download_dir.mkdir(parents=True, exist_ok=True)
+        download_dir = _ensure_dir(ctx.user_id, info_hash)
 
         atp.save_path = str(download_dir)
 
@@ -758,23 +1102,16 @@ async def download_torrent_from_magnet(
         atp.storage_mode = lt.storage_mode_t.storage_mode_allocate
 
         # Add torrent
-        handle = ses.add_torrent(atp)
+        metadata_event = _metadata_event(info_hash)
+        handle = await _add_torrent(ses, atp, info_hash)
         _active_torrents[info_hash] = handle
 
-        # Enable sequential download immediately for streaming
-        handle.set_sequential_download(True)
-
+        # No sequential mode: get_stream_url sets piece deadlines once a file is played
         logger.info(f"[TORRENT PROXY] Started download from magnet: {info_hash} for user {ctx.user_id}")
-        logger.info(f"[TORRENT PROXY] Sequential download enabled for streaming")
 
         # Wait a bit for metadata to be downloaded
         logger.info(f"[TORRENT PROXY] Waiting for metadata...")
-        for _ in range(50):  # Wait up to 5 seconds
-            if handle.has_metadata():
-                break
-            await asyncio.sleep(0.1)
-
-        if not handle.has_metadata():
+        if not await _wait_for_metadata(handle, metadata_event):
             logger.warning(f"[TORRENT PROXY] Metadata not yet available for {info_hash}")
             return {
                 "success": True,
@@ -791,6 +1128,7 @@ async def download_torrent_from_magnet(
         torrent_name = torrent_info.name()
         file_count = torrent_info.num_files()
         total_size = torrent_info.total_size()
+        _file_meta[info_hash] = _build_file_meta(torrent_info)
 
         return {
             "success": True,
@@ -839,14 +1177,14 @@ async def search_subtitles(
             'sublanguageid': language
         }
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(api_url, headers=headers, params=params)
+        client = get_http_client()
+        response = await client.get(api_url, headers=headers, params=params)
 
-            if response.status_code != 200:
-                logger.warning(f"[SUBTITLE SEARCH] API returned {response.status_code}")
-                return []
+        if response.status_code != 200:
+            logger.warning(f"[SUBTITLE SEARCH] API returned {response.status_code}")
+            return []
 
-            results = response.json()
+        results = orjson.loads(response.content)
 
         # Format and limit results
         subtitles = []
@@ -895,12 +1233,12 @@ async def download_subtitle(
             'User-Agent': 'VLSub 0.10.2'
         }
 
-        async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as client:
-            response = await client.get(download_link, headers=headers)
-            response.raise_for_status()
+        client = get_http_client()
+        response = await client.get(download_link, headers=headers, timeout=15.0)
+        response.raise_for_status()
 
-            # The content might be gzipped, httpx handles decompression automatically
-            subtitle_content = response.text
+        # The content might be gzipped, httpx handles decompression automatically
+        subtitle_content = response.text
 
         logger.info(f"[SUBTITLE] Downloaded subtitle successfully")
 
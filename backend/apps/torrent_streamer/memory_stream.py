@@ -9,18 +9,27 @@ import asyncio
 import logging
 from typing import Optional, AsyncIterator, Tuple
 from pathlib import Path
-import time
 
 from .libtorrent_shim import lt
+from .backend import (
+    _HAS_DEADLINE, get_lt_session, get_cached_piece, add_piece_waiter, discard_piece_waiter
+)
 
 logger = logging.getLogger(__name__)
 
+PIECE_TIMEOUT = 10.0  # seconds to wait for a single piece
+CRITICAL_PIECES = 4  # pieces at the start of a range that get a deadline
+DEADLINE_STEP_MS = 500  # deadline spacing between consecutive critical pieces
+PREFETCH_DEPTH = 8  # pieces awaited ahead of the one being sent to the client
+PRIORITY_WINDOW = 2 * PREFETCH_DEPTH  # pieces at top priority ahead of the stream
+
 
 class MemoryStreamReader:
     """Reads torrent data directly from memory/cache without disk I/O."""
 
     def __init__(self, handle: lt.torrent_handle, file_index: int):
         self.handle = handle
+        self.info_hash = str(handle.info_hash())
         self.file_index = file_index
         self.torrent_info = handle.torrent_file()
 
@@ -39,27 +48,29 @@ class MemoryStreamReader:
         logger.info(f"[MEMORY_STREAM] Initialized for file {file_index}: "
                    f"size={self.file_size}, pieces={self.first_piece}-{self.last_piece}")
 
-    def _read_piece_from_cache(self, piece_index: int) -> Optional[bytes]:
-        """Read a single piece directly from libtorrent's cache."""
-        try:
-            # Check if piece is available
-            if not self.handle.have_piece(piece_index):
-                return None
-
-            # Read piece directly from libtorrent
-            # This reads from memory cache if available, avoiding disk I/O
-            piece_data = self.handle.read_piece(piece_index)
+    async def _wait_for_piece(self, piece_index: int, timeout: float) -> Optional[bytes]:
+        """
+        Wait for a piece's data from libtorrent's read_piece_alert (no polling).
 
-            if piece_data is None:
-                # Piece not in cache, trigger async read
-                self.handle.read_piece_async(piece_index)
-                return None
+        Returns None on timeout or read error.
+        """
+        piece_data = get_cached_piece(self.info_hash, piece_index)
+        if piece_data is not None:
+            return piece_data
 
-            return bytes(piece_data)
+        future = add_piece_waiter(self.info_hash, piece_index)
+        # Already downloaded: have libtorrent post it now. Otherwise the alert
+        # pump reads it as soon as piece_finished_alert arrives.
+        if self.handle.have_piece(piece_index):
+            self.handle.read_piece(piece_index)
 
-        except Exception as e:
-            logger.error(f"[MEMORY_STREAM] Failed to read piece {piece_index}: {e}")
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
             return None
+        finally:
+            # No-op if the alert pump already resolved it
+            discard_piece_waiter(self.info_hash, piece_index, future)
 
     async def read_range(self, start: int, end: int) -> AsyncIterator[bytes]:
         """
@@ -87,56 +98,78 @@ class MemoryStreamReader:
 
         position = start
 
-        for piece_idx in range(start_piece, end_piece + 1):
-            # Prioritize this piece
-            self.handle.piece_priority(piece_idx, 7)
-            try:
-                self.handle.set_piece_deadline(piece_idx, 0, 0)
-            except:
-                pass
-
-            # Wait for piece with timeout
-            wait_start = time.time()
-            max_wait = 10.0  # 10 second timeout per piece
+        # Make sure the alert pump that resolves piece waiters is running
+        get_lt_session()
+
+        # Top priority only for a window just ahead of the stream, not the whole
+        # range (an open-ended range would starve every other torrent); the
+        # producer slides it forward. Deadlines (0ms, 500ms, ...) only on the
+        # first pieces, which block the initial yield
+        window_end = min(start_piece + PRIORITY_WINDOW, end_piece + 1)
+        self.handle.prioritize_pieces([(p, 7) for p in range(start_piece, window_end)])
+        if _HAS_DEADLINE:
+            for n, piece_idx in enumerate(range(start_piece, min(start_piece + CRITICAL_PIECES, end_piece + 1))):
+                self.handle.set_piece_deadline(piece_idx, n * DEADLINE_STEP_MS, 0)
+
+        # Prefetch pipeline: the producer keeps up to PREFETCH_DEPTH piece waits
+        # in flight (bounded queue = backpressure) while we send the current one
+        queue: asyncio.Queue = asyncio.Queue(maxsize=PREFETCH_DEPTH)
+
+        async def produce():
+            nonlocal window_end
+            for idx in range(start_piece, end_piece + 1):
+                if idx == window_end:
+                    # Bounded queue: idx is at most PREFETCH_DEPTH + 1 pieces
+                    # ahead of the one being sent, so the window stays close
+                    window_end = min(window_end + PREFETCH_DEPTH, end_piece + 1)
+                    self.handle.prioritize_pieces([(p, 7) for p in range(idx, window_end)])
+                task = asyncio.ensure_future(self._wait_for_piece(idx, PIECE_TIMEOUT))
+                await queue.put((idx, task))
+
+        producer = asyncio.create_task(produce())
 
-            while not self.handle.have_piece(piece_idx):
-                if time.time() - wait_start > max_wait:
-                    logger.warning(f"[MEMORY_STREAM] Timeout waiting for piece {piece_idx}")
-                    return
-
-                await asyncio.sleep(0.05)
+        try:
+            for _ in range(start_piece, end_piece + 1):
+                piece_idx, task = await queue.get()
 
-            # Read piece from cache
-            piece_data = self._read_piece_from_cache(piece_idx)
+                # Wait for the piece's data, pushed by the alert pump
+                piece_data = await task
 
-            if piece_data is None:
-                # Try reading from cache a few times
-                for _ in range(5):
-                    await asyncio.sleep(0.1)
-                    piece_data = self._read_piece_from_cache(piece_idx)
-                    if piece_data:
-                        break
+                if piece_data is None and not self.handle.have_piece(piece_idx):
+                    # A prefetched wait may have started long before this piece's
+                    # turn; give it a full timeout from now
+                    piece_data = await self._wait_for_piece(piece_idx, PIECE_TIMEOUT)
 
                 if piece_data is None:
+                    if not self.handle.have_piece(piece_idx):
+                        logger.warning(f"[MEMORY_STREAM] Timeout waiting for piece {piece_idx}")
+                        return
+
                     logger.error(f"[MEMORY_STREAM] Failed to read piece {piece_idx} from cache")
                     # Fall back to disk read if cache fails
                     piece_data = await self._read_piece_from_disk(piece_idx)
                     if piece_data is None:
                         return
 
-            # Calculate offsets within the piece
-            piece_start_abs = piece_idx * self.piece_length
-            piece_end_abs = min(piece_start_abs + self.piece_length - 1,
-                               self.file_offset + self.file_size - 1)
-
-            # Calculate what part of this piece we need
-            read_start = max(0, absolute_start - piece_start_abs)
-            read_end = min(len(piece_data) - 1, absolute_end - piece_start_abs)
-
-            if read_start <= read_end:
-                chunk = piece_data[read_start:read_end + 1]
-                position += len(chunk)
-                yield chunk
+                # Calculate offsets within the piece
+                piece_start_abs = piece_idx * self.piece_length
+                piece_end_abs = min(piece_start_abs + self.piece_length - 1,
+                                   self.file_offset + self.file_size - 1)
+
+                # Calculate what part of this piece we need
+                read_start = max(0, absolute_start - piece_start_abs)
+                read_end = min(len(piece_data) - 1, absolute_end - piece_start_abs)
+
+                if read_start <= read_end:
+                    chunk = piece_data[read_start:read_end + 1]
+                    position += len(chunk)
+                    yield chunk
+        finally:
+            # Client went away or range finished: drop outstanding prefetches
+            producer.cancel()
+            while not queue.empty():
+                _, task = queue.get_nowait()
+                task.cancel()
 
     async def _read_piece_from_disk(self, piece_index: int) -> Optional[bytes]:
         """Fallback to read piece from disk if cache fails."""
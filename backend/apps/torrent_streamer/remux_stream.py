@@ -13,11 +13,16 @@ from typing import AsyncIterator, Optional
 import subprocess
 import os
 import signal
+import time
 
 from .libtorrent_shim import lt
 
 logger = logging.getLogger(__name__)
 
+CRITICAL_PIECES = 4  # missing pieces at the front of the buffer that get a deadline
+DEADLINE_STEP_MS = 500  # deadline spacing between consecutive critical pieces
+REANNOUNCE_INTERVAL = 60.0  # min seconds between forced tracker/DHT announces
+
 
 class RemuxStreamer:
     """Remuxes MKV/AVI files to MP4 on-the-fly for browser playback."""
@@ -45,6 +50,9 @@ class RemuxStreamer:
         self.first_piece = self.file_offset // self.piece_length
         self.last_piece = (self.file_offset + self.file_size - 1) // self.piece_length
 
+        # monotonic time of the last forced announce (buffer polls are frequent)
+        self._last_reannounce = 0.0
+
         logger.info(f"[REMUX] Initialized for {self.file_entry.path}")
 
     def calculate_adaptive_buffer_mb(self) -> int:
@@ -154,27 +162,16 @@ class RemuxStreamer:
                            self.file_offset + self.file_size - 1)
 
         start_piece = absolute_start // self.piece_length
-        end_piece = absolute_end // self.piece_length
+        end_piece = min(absolute_end // self.piece_length, self.torrent_info.num_pieces() - 1)
 
         # Check if pieces are available CONTIGUOUSLY from start
         missing = []
         contiguous_bytes = 0
 
-        for p in range(start_piece, min(end_piece + 1, self.torrent_info.num_pieces())):
+        for p in range(start_piece, end_piece + 1):
             if not self.handle.have_piece(p):
-                missing.append(p)
-                # MAXIMUM PRIORITY for the blocking piece
-                self.handle.piece_priority(p, 7)
-                try:
-                    self.handle.set_piece_deadline(p, 0, 1)  # Alert mode - immediate download
-                    # If this is the first missing piece, force reannounce to get more peers
-                    if len(missing) == 1:
-                        self.handle.force_reannounce()
-                        self.handle.force_dht_announce()
-                        logger.info(f"[REMUX] Forced reannounce for critical piece {p}")
-                except Exception as e:
-                    logger.warning(f"[REMUX] Could not set deadline for piece {p}: {e}")
                 # Stop counting contiguous bytes when we hit a missing piece
+                missing = self._prioritize_buffer(p, end_piece)
                 break
             else:
                 # Count how many contiguous bytes we have
@@ -192,12 +189,44 @@ class RemuxStreamer:
         contiguous_mb = contiguous_bytes / (1024 * 1024)
 
         if missing:
-            logger.info(f"[REMUX] Have {contiguous_mb:.1f}MB contiguous, need {min_buffer_mb}MB. Missing {len(missing)} pieces: {missing[:10]}...")
+            logger.info(f"[REMUX] Have {contiguous_mb:.1f}MB contiguous, need {min_buffer_mb}MB. Next missing pieces: {missing}")
             return False
 
         logger.info(f"[REMUX] Have {contiguous_mb:.1f}MB contiguous data ready")
         return True
 
+    def _prioritize_buffer(self, first_missing: int, end_piece: int) -> list[int]:
+        """
+        Prioritize the rest of the buffer from the first missing piece in one call.
+
+        Deadlines (0ms, 500ms, ...) go only to the first CRITICAL_PIECES missing
+        pieces. Returns those pieces.
+        """
+        priorities = self.handle.get_piece_priorities()
+        priorities[first_missing:end_piece + 1] = [7] * (end_piece - first_missing + 1)
+        self.handle.prioritize_pieces(priorities)
+
+        critical = []
+        for p in range(first_missing, end_piece + 1):
+            if not self.handle.have_piece(p):
+                critical.append(p)
+                if len(critical) == CRITICAL_PIECES:
+                    break
+        try:
+            for n, p in enumerate(critical):
+                self.handle.set_piece_deadline(p, n * DEADLINE_STEP_MS, 1 if n == 0 else 0)
+            # Force reannounce to get more peers for the blocking piece, at most
+            # once per REANNOUNCE_INTERVAL so buffer polling doesn't spam trackers
+            now = time.monotonic()
+            if now - self._last_reannounce >= REANNOUNCE_INTERVAL:
+                self._last_reannounce = now
+                self.handle.force_reannounce()
+                self.handle.force_dht_announce()
+                logger.info(f"[REMUX] Forced reannounce for critical piece {first_missing}")
+        except Exception as e:
+            logger.warning(f"[REMUX] Could not set deadlines from piece {first_missing}: {e}")
+        return critical
+
     def get_contiguous_bytes_available(self) -> int:
         """
         Calculate how many contiguous bytes are available from the start of the file.
@@ -0,0 +1,11 @@
+"""
+Shared test setup.
+
+Settings are read at import time, so the environment they need is set
+before any app module is imported.
+"""
+import os
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+# Low bcrypt cost keeps password tests fast
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
@@ -0,0 +1,79 @@
+"""Tests for the index back-fill run by init_db on existing databases."""
+import pytest
+from sqlalchemy import create_engine, inspect
+
+import app.models  # noqa: F401  Registers all tables
+from app.database import (
+    ADDED_INDEXES,
+    USERS_EMAIL_LOWER_INDEX,
+    Base,
+    _create_added_indexes,
+    _create_users_email_lower_index,
+    _index_is_unique,
+)
+
+
+def table_of(index_name):
+    for table in Base.metadata.sorted_tables:
+        if any(index.name == index_name for index in table.indexes):
+            return table
+    raise LookupError(index_name)
+
+
+@pytest.mark.parametrize("index_name", ADDED_INDEXES)
+def test_added_index_is_created_on_existing_table(index_name):
+    table = table_of(index_name)
+    engine = create_engine("sqlite://")
+
+    with engine.begin() as conn:
+        # A table created before the index was declared on the model
+        Base.metadata.create_all(conn)
+        conn.exec_driver_sql(f"DROP INDEX {index_name}")
+
+        _create_added_indexes(conn)
+        # Safe to run on every startup
+        _create_added_indexes(conn)
+
+        names = {index["name"] for index in inspect(conn).get_indexes(table.name)}
+
+    assert index_name in names
+
+
+def users_email_index_is_unique(conn):
+    return _index_is_unique(conn, USERS_EMAIL_LOWER_INDEX)
+
+
+def existing_users_table(conn, *emails):
+    Base.metadata.create_all(conn)
+    conn.exec_driver_sql(f"DROP INDEX {USERS_EMAIL_LOWER_INDEX}")
+    users = Base.metadata.tables["users"]
+    for email in emails:
+        conn.execute(users.insert().values(email=email, hashed_password="x"))
+
+
+def test_users_email_index_is_unique_without_case_collisions():
+    engine = create_engine("sqlite://")
+
+    with engine.begin() as conn:
+        existing_users_table(conn, "a@example.com", "b@example.com")
+        _create_users_email_lower_index(conn)
+        _create_users_email_lower_index(conn)
+        unique = users_email_index_is_unique(conn)
+
+    assert unique is True
+
+
+def test_users_email_index_falls_back_until_collisions_are_merged():
+    engine = create_engine("sqlite://")
+
+    with engine.begin() as conn:
+        existing_users_table(conn, "a@example.com", "A@example.com")
+        _create_users_email_lower_index(conn)
+        fallback_unique = users_email_index_is_unique(conn)
+
+        conn.exec_driver_sql("DELETE FROM users WHERE email = 'A@example.com'")
+        _create_users_email_lower_index(conn)
+        merged_unique = users_email_index_is_unique(conn)
+
+    assert fallback_unique is False
+    assert merged_unique is True
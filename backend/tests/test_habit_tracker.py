@@ -0,0 +1,298 @@
+"""Tests for habit streaks stored on the habit, across UI actions and agent tools."""
+import asyncio
+import copy
+import itertools
+from datetime import date, datetime, timedelta
+
+from apps.habit_tracker import agent_tools, backend
+
+
+class FakeStorage:
+    """In-memory ctx.storage with the where forms the habit tracker uses."""
+
+    def __init__(self):
+        self.tables = {}
+        self.ids = itertools.count(1)
+        self.find_one_calls = 0
+
+    @staticmethod
+    def _matches(record, where):
+        for key, value in (where or {}).items():
+            field, _, op = key.partition("__")
+            actual = record.get(field)
+            if op == "in":
+                if actual not in value:
+                    return False
+            elif op == "gte":
+                if actual is None or actual < value:
+                    return False
+            elif actual != value:
+                return False
+        return True
+
+    async def insert(self, table, data):
+        record = {"id": f"{table}-{next(self.ids)}", **data}
+        self.tables.setdefault(table, []).append(record)
+        return copy.deepcopy(record)
+
+    async def insert_many(self, table, records):
+        return [await self.insert(table, record) for record in records]
+
+    async def update(self, table, record_id, data):
+        for record in self.tables.get(table, []):
+            if record["id"] == record_id:
+                record.update(data)
+                return copy.deepcopy(record)
+        raise ValueError(f"Record {record_id} not found")
+
+    async def find_one(self, table, where):
+        self.find_one_calls += 1
+        records = await self.query(table, where=where, limit=1)
+        return records[0] if records else None
+
+    async def query(self, table, where=None, order_by=None, limit=None):
+        records = [
+            copy.deepcopy(record)
+            for record in self.tables.get(table, [])
+            if self._matches(record, where)
+        ]
+        for field, direction in (order_by or {}).items():
+            records.sort(key=lambda r: r.get(field) or "", reverse=direction == "desc")
+        return records[:limit] if limit else records
+
+    async def distinct_dates(self, table, field, where=None):
+        days = {
+            record[field][:10]
+            for record in self.tables.get(table, [])
+            if self._matches(record, where) and record.get(field)
+        }
+        return [date.fromisoformat(day) for day in sorted(days, reverse=True)]
+
+
+class FakeStreams:
+    async def publish(self, stream_id, data):
+        pass
+
+
+class FakeNotifications:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, notification):
+        self.sent.append(notification)
+
+
+class FakeContext:
+    """A PlatformContext stand-in; several contexts can share one storage."""
+
+    def __init__(self, storage):
+        self.user_id = 1
+        self.storage = storage
+        self.streams = FakeStreams()
+        self.notifications = FakeNotifications()
+
+    def now(self):
+        return datetime.utcnow()
+
+
+def days_ago(n):
+    return (datetime.utcnow() - timedelta(days=n)).date()
+
+
+def run(coro):
+    async def main():
+        result = await coro
+        # Let fire-and-forget stream publishes finish inside the loop
+        await asyncio.sleep(0)
+        return result
+    return asyncio.run(main())
+
+
+def add_habit(storage, **fields):
+    record = backend._new_habit_record(name="Read", **fields)
+    return run(storage.insert("habits", record))
+
+
+def test_first_log_starts_stored_streak():
+    storage = FakeStorage()
+    ctx = FakeContext(storage)
+    habit = add_habit(storage)
+
+    run(backend.log_habit(ctx, habit["id"]))
+
+    stored = storage.tables["habits"][0]
+    assert stored["current_streak"] == 1
+    assert stored["last_completed_date"] == days_ago(0).isoformat()
+
+
+def test_log_extends_yesterdays_streak_and_same_day_keeps_it():
+    storage = FakeStorage()
+    ctx = FakeContext(storage)
+    habit = add_habit(storage)
+    run(storage.update("habits", habit["id"], {
+        "current_streak": 3,
+        "last_completed_date": days_ago(1).isoformat(),
+    }))
+
+    run(backend.log_habit(ctx, habit["id"]))
+    run(backend.log_habit(ctx, habit["id"]))
+
+    assert storage.tables["habits"][0]["current_streak"] == 4
+
+
+def test_log_after_a_gap_restarts_streak():
+    storage = FakeStorage()
+    ctx = FakeContext(storage)
+    habit = add_habit(storage)
+    run(storage.update("habits", habit["id"], {
+        "current_streak": 9,
+        "last_completed_date": days_ago(3).isoformat(),
+    }))
+
+    run(backend.log_habit(ctx, habit["id"]))
+
+    assert storage.tables["habits"][0]["current_streak"] == 1
+
+
+def test_log_looks_the_habit_up_once():
+    storage = FakeStorage()
+    ctx = FakeContext(storage)
+    habit = add_habit(storage)
+
+    run(backend.log_habit(ctx, habit["id"]))
+
+    assert storage.find_one_calls == 1
+
+
+def test_legacy_habit_streak_is_materialized_from_logs():
+    storage = FakeStorage()
+    ctx = FakeContext(storage)
+    # Created before streaks were stored on the habit
+    habit = run(storage.insert("habits", {"name": "Read", "frequency": "daily", "active": True}))
+    for n in (1, 2):
+        run(storage.insert("habit_logs", {
+            "habit_id": habit["id"],
+            "completed_at": datetime.combine(days_ago(n), datetime.min.time()).isoformat(),
+        }))
+
+    run(backend.log_habit(ctx, habit["id"]))
+
+    stored = storage.tables["habits"][0]
+    assert stored["current_streak"] == 3
+    assert stored["last_completed_date"] == days_ago(0).isoformat()
+
+
+def test_agent_sees_streak_logged_from_the_ui():
+    storage = FakeStorage()
+    ui_ctx = FakeContext(storage)
+    # The app agent keeps one context across requests
+    agent_ctx = FakeContext(storage)
+    habit = add_habit(storage)
+
+    run(agent_tools.view_habit_history(agent_ctx, habit["id"]))
+    run(backend.log_habit(ui_ctx, habit["id"]))
+    habits = run(agent_tools.view_habits(agent_ctx))
+
+    assert habits["habits"][0]["current_streak"] == 1
+
+
+def test_agent_sees_habit_changed_from_the_ui():
+    storage = FakeStorage()
+    ui_ctx = FakeContext(storage)
+    agent_ctx = FakeContext(storage)
+    habit = add_habit(storage)
+
+    run(agent_tools.view_habit_history(agent_ctx, habit["id"]))
+    run(backend.update_habit(ui_ctx, habit["id"], name="Read daily"))
+    history = run(agent_tools.view_habit_history(agent_ctx, habit["id"]))
+
+    assert history["habit_name"] == "Read daily"
+
+
+def test_agent_log_reports_stored_streak():
+    storage = FakeStorage()
+    ui_ctx = FakeContext(storage)
+    agent_ctx = FakeContext(storage)
+    habit = add_habit(storage)
+    run(storage.update("habits", habit["id"], {
+        "current_streak": 5,
+        "last_completed_date": days_ago(2).isoformat(),
+    }))
+
+    # The agent reads the habit, then the UI logs it and renames it
+    run(agent_tools.view_habit_history(agent_ctx, habit["id"]))
+    run(backend.log_habit(ui_ctx, habit["id"]))
+    run(backend.update_habit(ui_ctx, habit["id"], name="Read daily"))
+
+    result = run(agent_tools.log_habit_completion(agent_ctx, habit["id"]))
+
+    assert result["success"]
+    # Logged the same day as the UI log: the streak is unchanged
+    assert result["current_streak"] == 1
+    assert "Read daily" in result["message"]
+
+
+def test_agent_log_of_unknown_habit_fails_cleanly():
+    ctx = FakeContext(FakeStorage())
+
+    result = run(agent_tools.log_habit_completion(ctx, "missing"))
+
+    assert result == {"success": False, "error": "Habit missing not found"}
+
+
+def test_lapsed_daily_streak_reads_as_zero():
+    habit = {
+        "frequency": "daily",
+        "current_streak": 6,
+        "last_completed_date": days_ago(2).isoformat(),
+    }
+
+    today = days_ago(0)
+
+    assert backend.stored_streak(habit, today) == 0
+    assert backend.stored_streak(
+        {**habit, "last_completed_date": days_ago(1).isoformat()}, today
+    ) == 6
+
+
+def test_streak_is_measured_from_the_context_clock():
+    storage = FakeStorage()
+    ctx = FakeContext(storage)
+    habit = add_habit(storage)
+    run(storage.update("habits", habit["id"], {
+        "current_streak": 4,
+        "last_completed_date": days_ago(5).isoformat(),
+    }))
+    # The context's clock, not the server's, decides whether it lapsed
+    ctx.now = lambda: datetime.combine(days_ago(4), datetime.min.time())
+
+    assert run(backend.calculate_streak(ctx, habit["id"])) == 4
+    assert run(backend.get_habits(ctx))[0]["current_streak"] == 4
+
+
+def test_seventh_day_sends_milestone_notification():
+    storage = FakeStorage()
+    ctx = FakeContext(storage)
+    habit = add_habit(storage)
+    run(storage.update("habits", habit["id"], {
+        "current_streak": 6,
+        "last_completed_date": days_ago(1).isoformat(),
+    }))
+
+    run(backend.log_habit(ctx, habit["id"]))
+
+    assert [n["type"] for n in ctx.notifications.sent] == ["celebration"]
+
+
+def test_agent_log_looks_the_habit_up_once():
+    storage = FakeStorage()
+    ctx = FakeContext(storage)
+    habit = add_habit(storage)
+
+    result = run(agent_tools.log_habit_completion(ctx, habit["id"]))
+
+    assert result["current_streak"] == 1
+    # log_habit's lookup and the re-read share the invocation's cache
+    assert storage.find_one_calls == 1
+    # ...which is gone once the tool returns
+    assert backend._habit_cache.get() is None
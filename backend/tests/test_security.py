@@ -0,0 +1,167 @@
+"""Tests for password hashing, JWT tokens and the login path."""
+import asyncio
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+import bcrypt
+import pytest
+from jose import JWTError, jwt
+
+from app.config import settings
+from app.utils import security
+
+
+class FakeResult:
+    def __init__(self, row):
+        self._row = row
+
+    def first(self):
+        return self._row
+
+
+class FakeSession:
+    """Just enough of AsyncSession for authenticate_user."""
+
+    def __init__(self, user=None):
+        self.user = user
+        self.commits = 0
+
+    async def execute(self, statement):
+        if self.user is None:
+            return FakeResult(None)
+        return FakeResult(SimpleNamespace(
+            id=self.user.id, hashed_password=self.user.hashed_password
+        ))
+
+    async def get(self, model, ident):
+        assert ident == self.user.id
+        return self.user
+
+    async def commit(self):
+        self.commits += 1
+
+
+def make_user(password, rounds=None):
+    hashed = bcrypt.hashpw(
+        password.encode(), bcrypt.gensalt(rounds=rounds or settings.bcrypt_rounds)
+    ).decode()
+    return SimpleNamespace(id=1, email="user@example.com", hashed_password=hashed)
+
+
+def test_password_hash_round_trip():
+    hashed = security.get_password_hash("correct horse")
+
+    assert hashed.startswith(f"$2b${settings.bcrypt_rounds:02d}$")
+    assert security.verify_password("correct horse", hashed)
+    assert not security.verify_password("wrong horse", hashed)
+
+
+def test_verify_password_rejects_malformed_hash():
+    assert not security.verify_password("secret", "not-a-bcrypt-hash")
+
+
+def test_passwords_truncated_at_72_bytes():
+    hashed = security.get_password_hash("a" * 72)
+
+    assert security.verify_password("a" * 72 + "ignored", hashed)
+
+
+def test_password_needs_rehash_on_cost_change():
+    current = security.get_password_hash("secret")
+    older = make_user("secret", rounds=settings.bcrypt_rounds + 1).hashed_password
+
+    assert not security.password_needs_rehash(current)
+    assert security.password_needs_rehash(older)
+    assert security.password_needs_rehash("garbage")
+
+
+def test_dummy_hash_is_made_once_on_first_use(monkeypatch):
+    monkeypatch.setattr(security, "_dummy_password_hash", None)
+
+    first = asyncio.run(security._get_dummy_password_hash())
+    second = asyncio.run(security._get_dummy_password_hash())
+
+    assert first is second
+    assert not security.password_needs_rehash(first)
+
+
+def test_access_token_round_trip():
+    token = security.create_access_token({"sub": "42"})
+
+    payload = security.verify_access_token(token)
+
+    assert payload["sub"] == "42"
+    # The HS256 fast path must produce tokens python-jose accepts
+    assert jwt.decode(token, settings.secret_key, algorithms=["HS256"])["sub"] == "42"
+
+
+def test_access_token_is_cached_until_expiry():
+    token = security.create_access_token({"sub": "7"})
+
+    first = security.verify_access_token(token)
+    second = security.verify_access_token(token)
+
+    assert first is second
+
+
+def test_expired_access_token_is_rejected():
+    token = security.create_access_token({"sub": "1"}, timedelta(seconds=-10))
+
+    with pytest.raises(JWTError):
+        security.verify_access_token(token)
+
+
+def test_tampered_access_token_is_rejected():
+    token = security.create_access_token({"sub": "1"})
+    header, payload, signature = token.split(".")
+    forged = security._b64url(b'{"sub":"2","exp":%d}' % (time.time() + 60)).decode()
+
+    with pytest.raises(JWTError):
+        security.verify_access_token(f"{header}.{forged}.{signature}")
+
+
+def test_authenticate_unknown_email_checks_dummy_hash(monkeypatch):
+    checked = []
+
+    async def fake_verify(password, hashed_password):
+        checked.append(hashed_password)
+        return False
+
+    monkeypatch.setattr(security, "averify_password", fake_verify)
+
+    user = asyncio.run(security.authenticate_user(FakeSession(), "nobody@example.com", "pw"))
+
+    assert user is None
+    assert checked == [asyncio.run(security._get_dummy_password_hash())]
+
+
+def test_authenticate_wrong_password():
+    db = FakeSession(make_user("right"))
+
+    assert asyncio.run(security.authenticate_user(db, "user@example.com", "wrong")) is None
+    assert db.commits == 0
+
+
+def test_authenticate_correct_password():
+    user = make_user("right")
+    stored_hash = user.hashed_password
+    db = FakeSession(user)
+
+    result = asyncio.run(security.authenticate_user(db, "USER@example.com", "right"))
+
+    assert result is user
+    assert user.hashed_password == stored_hash
+    assert db.commits == 0
+
+
+def test_authenticate_rehashes_old_cost():
+    user = make_user("right", rounds=settings.bcrypt_rounds + 1)
+    db = FakeSession(user)
+
+    result = asyncio.run(security.authenticate_user(db, "user@example.com", "right"))
+
+    assert result is user
+    assert not security.password_needs_rehash(user.hashed_password)
+    assert security.verify_password("right", user.hashed_password)
+    assert db.commits == 1
@@ -0,0 +1,122 @@
+"""Tests for StorageAPI where-clause building."""
+import asyncio
+from datetime import datetime, timezone
+
+from app.core.storage_api import StorageAPI
+
+
+def build_where(where):
+    return StorageAPI(db=None, user_id=1, app_id="habit-tracker")._build_where(where)
+
+
+def test_always_scoped_to_user():
+    sql, params = build_where(None)
+
+    assert sql == "user_id = 1"
+    assert params == {}
+
+
+def test_equality_by_value_type():
+    sql, params = build_where({
+        "name": "Read",
+        "target_count": 3,
+        "active": True,
+    })
+
+    assert sql == (
+        "user_id = 1"
+        " AND data->>'name' = :where_0"
+        " AND (data->>'target_count')::numeric = :where_1"
+        " AND (data->'active')::boolean = :where_2"
+    )
+    assert params == {"where_0": "Read", "where_1": 3, "where_2": True}
+
+
+def test_numeric_comparison_casts_to_numeric():
+    sql, params = build_where({"duration_minutes__gte": 10, "score__lt": 2.5})
+
+    assert "(data->>'duration_minutes')::numeric >= :where_0" in sql
+    assert "(data->>'score')::numeric < :where_1" in sql
+    assert params == {"where_0": 10, "where_1": 2.5}
+
+
+def test_boolean_comparison_casts_to_boolean():
+    sql, params = build_where({"active__gt": False})
+
+    assert "(data->'active')::boolean > :where_0" in sql
+    assert params == {"where_0": False}
+
+
+def test_string_comparison_stays_text():
+    sql, params = build_where({"completed_at__lte": "2026-01-31T23:59:59"})
+
+    assert "data->>'completed_at' <= :where_0" in sql
+    assert params == {"where_0": "2026-01-31T23:59:59"}
+
+
+def test_system_field_comparison_uses_column():
+    since = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    sql, params = build_where({"created_at__gt": since})
+
+    assert "created_at > :where_0" in sql
+    assert params == {"where_0": since}
+
+
+def test_in_binds_one_array():
+    sql, params = build_where({"habit_id__in": ["a", "b"], "id__in": ["x"]})
+
+    assert "data->>'habit_id' = ANY(:where_0)" in sql
+    assert "id = ANY(:where_1)" in sql
+    assert params == {"where_0": ["a", "b"], "where_1": ["x"]}
+
+
+def test_in_serializes_values_as_json_text():
+    sql, params = build_where({"active__in": [True, False], "count__in": [1, 2.5]})
+
+    # ->> returns JSON booleans as "true"/"false"
+    assert params["where_0"] == ["true", "false"]
+    assert params["where_1"] == ["1", "2.5"]
+
+
+def test_only_known_suffixes_are_operators():
+    sql, params = build_where({"meta__source": "import", "meta__note__in": ["x"]})
+
+    assert "data->>'meta__source' = :where_0" in sql
+    assert "data->>'meta__note' = ANY(:where_1)" in sql
+    assert params == {"where_0": "import", "where_1": ["x"]}
+
+
+def test_nested_field_uses_last_segment():
+    sql, _ = build_where({"data.category": "health"})
+
+    assert "data->>'category' = :where_0" in sql
+
+
+class CapturingSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        self.statements.append((str(statement), params))
+        return self
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return []
+
+
+def test_distinct_dates_skips_records_without_the_field():
+    db = CapturingSession()
+    storage = StorageAPI(db=db, user_id=1, app_id="habit-tracker")
+
+    asyncio.run(storage.distinct_dates(
+        "habit_logs", "completed_at", where={"habit_id": "h1"}
+    ))
+
+    (sql, params), = db.statements
+    assert "data->>'completed_at' IS NOT NULL" in sql
+    assert "FROM app_habit_tracker_habit_logs" in sql
+    assert params == {"where_0": "h1"}
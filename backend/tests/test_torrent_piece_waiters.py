@@ -0,0 +1,311 @@
+"""Tests for alert-driven piece waiters and memory streaming."""
+import asyncio
+import sys
+import types
+from collections import OrderedDict
+
+import pytest
+
+
+def _fake_libtorrent():
+    """The parts of the libtorrent module the piece pipeline touches."""
+    lt = types.ModuleType("libtorrent")
+
+    class Error:
+        def __init__(self, code=0):
+            self.code = code
+
+        def value(self):
+            return self.code
+
+        def message(self):
+            return f"error {self.code}"
+
+    class read_piece_alert:
+        def __init__(self, handle, piece, buffer, error=0):
+            self.handle = handle
+            self.piece = piece
+            self.buffer = buffer
+            self.size = len(buffer)
+            self.error = Error(error)
+
+    class piece_finished_alert:
+        def __init__(self, handle, piece_index):
+            self.handle = handle
+            self.piece_index = piece_index
+
+    for name in ("state_update_alert", "add_torrent_alert", "metadata_received_alert",
+                 "torrent_handle", "session"):
+        setattr(lt, name, type(name, (), {}))
+    lt.read_piece_alert = read_piece_alert
+    lt.piece_finished_alert = piece_finished_alert
+    return lt
+
+
+FAKE_LT = _fake_libtorrent()
+
+try:
+    import libtorrent  # noqa: F401
+except ImportError:
+    sys.modules["libtorrent"] = FAKE_LT
+
+from apps.torrent_streamer import backend, memory_stream  # noqa: E402
+
+INFO_HASH = "abc123"
+PIECE_LENGTH = 16
+
+
+class FakeFileEntry:
+    def __init__(self, offset, size):
+        self.offset = offset
+        self.size = size
+        self.path = "movie.mp4"
+
+
+class FakeTorrentInfo:
+    def __init__(self, num_pieces):
+        self.entry = FakeFileEntry(0, num_pieces * PIECE_LENGTH)
+
+    def num_files(self):
+        return 1
+
+    def files(self):
+        return types.SimpleNamespace(at=lambda index: self.entry)
+
+    def piece_length(self):
+        return PIECE_LENGTH
+
+
+class FakeHandle:
+    """
+    A torrent handle whose read_piece posts a read_piece_alert, the way
+    libtorrent does, through the alert dispatcher.
+    """
+
+    def __init__(self, num_pieces=4, have=()):
+        self.num_pieces = num_pieces
+        self.have = set(have)
+        self.reads = []
+        self.priorities = [4] * num_pieces
+        self.prioritize_calls = []
+        self.deadlines = []
+
+    def info_hash(self):
+        return INFO_HASH
+
+    def torrent_file(self):
+        return FakeTorrentInfo(self.num_pieces)
+
+    def have_piece(self, piece):
+        return piece in self.have
+
+    def read_piece(self, piece):
+        self.reads.append(piece)
+        asyncio.get_running_loop().call_soon(
+            backend._dispatch_alert,
+            FAKE_LT.read_piece_alert(self, piece, piece_bytes(piece)),
+        )
+
+    def finish_piece(self, piece):
+        """Simulate a piece completing its download."""
+        self.have.add(piece)
+        backend._dispatch_alert(FAKE_LT.piece_finished_alert(self, piece))
+
+    def get_piece_priorities(self):
+        return list(self.priorities)
+
+    def prioritize_pieces(self, priorities):
+        self.prioritize_calls.append(list(priorities))
+        for piece, priority in priorities:
+            self.priorities[piece] = priority
+
+    def set_piece_deadline(self, piece, deadline, flags=0):
+        self.deadlines.append((piece, deadline))
+
+
+def piece_bytes(piece):
+    return bytes([piece]) * PIECE_LENGTH
+
+
+@pytest.fixture(autouse=True)
+def fresh_piece_state(monkeypatch):
+    monkeypatch.setattr(backend, "lt", FAKE_LT)
+    monkeypatch.setattr(backend, "_piece_waiters", {})
+    monkeypatch.setattr(backend, "_piece_cache", OrderedDict())
+    monkeypatch.setattr(backend, "_piece_cache_bytes", 0)
+    # No libtorrent session or alert pump: tests dispatch alerts themselves
+    monkeypatch.setattr(memory_stream, "get_lt_session", lambda: None)
+
+
+def test_cached_piece_needs_no_waiter():
+    handle = FakeHandle()
+    backend._cache_piece(INFO_HASH, 1, b"cached")
+    reader = memory_stream.MemoryStreamReader(handle, 0)
+
+    data = asyncio.run(reader._wait_for_piece(1, timeout=1))
+
+    assert data == b"cached"
+    assert handle.reads == []
+    assert backend._piece_waiters == {}
+
+
+def test_finished_piece_resolves_waiter():
+    handle = FakeHandle()
+    reader = memory_stream.MemoryStreamReader(handle, 0)
+
+    async def main():
+        wait = asyncio.ensure_future(reader._wait_for_piece(2, timeout=1))
+        await asyncio.sleep(0)
+        assert handle.reads == []  # not downloaded yet: nothing to read
+        handle.finish_piece(2)
+        return await wait
+
+    assert asyncio.run(main()) == piece_bytes(2)
+    assert handle.reads == [2]
+    assert backend._piece_waiters == {}
+    assert backend.get_cached_piece(INFO_HASH, 2) == piece_bytes(2)
+
+
+def test_downloaded_piece_is_read_right_away():
+    handle = FakeHandle(have={0})
+    reader = memory_stream.MemoryStreamReader(handle, 0)
+
+    data = asyncio.run(reader._wait_for_piece(0, timeout=1))
+
+    assert data == piece_bytes(0)
+    assert handle.reads == [0]
+
+
+def test_every_waiter_for_a_piece_is_resolved():
+    handle = FakeHandle()
+
+    async def main():
+        first = backend.add_piece_waiter(INFO_HASH, 3)
+        second = backend.add_piece_waiter(INFO_HASH, 3)
+        handle.finish_piece(3)
+        return await asyncio.gather(first, second)
+
+    assert asyncio.run(main()) == [piece_bytes(3), piece_bytes(3)]
+    assert backend._piece_waiters == {}
+
+
+def test_read_error_resolves_none():
+    handle = FakeHandle()
+
+    async def main():
+        future = backend.add_piece_waiter(INFO_HASH, 1)
+        backend._dispatch_alert(FAKE_LT.read_piece_alert(handle, 1, b"", error=5))
+        return await future
+
+    assert asyncio.run(main()) is None
+    assert backend.get_cached_piece(INFO_HASH, 1) is None
+
+
+def test_finished_piece_without_waiter_is_not_read():
+    handle = FakeHandle()
+
+    handle.finish_piece(1)
+
+    assert handle.reads == []
+
+
+def test_timeout_returns_none_and_removes_waiter():
+    handle = FakeHandle()
+    reader = memory_stream.MemoryStreamReader(handle, 0)
+
+    data = asyncio.run(reader._wait_for_piece(1, timeout=0.01))
+
+    assert data is None
+    assert backend._piece_waiters == {}
+
+
+def test_discard_keeps_other_waiters():
+    async def main():
+        first = backend.add_piece_waiter(INFO_HASH, 0)
+        second = backend.add_piece_waiter(INFO_HASH, 0)
+        backend.discard_piece_waiter(INFO_HASH, 0, first)
+        assert backend._piece_waiters == {(INFO_HASH, 0): [second]}
+        backend.discard_piece_waiter(INFO_HASH, 0, second)
+        # Discarding twice is a no-op
+        backend.discard_piece_waiter(INFO_HASH, 0, second)
+
+    asyncio.run(main())
+    assert backend._piece_waiters == {}
+
+
+def test_read_range_streams_pieces_as_they_finish():
+    handle = FakeHandle(num_pieces=4, have={0})
+    reader = memory_stream.MemoryStreamReader(handle, 0)
+
+    async def main():
+        chunks = []
+
+        async def consume():
+            async for chunk in reader.read_range(4, 4 * PIECE_LENGTH - 5):
+                chunks.append(chunk)
+
+        stream = asyncio.ensure_future(consume())
+        for piece in (1, 2, 3):
+            await asyncio.sleep(0.01)
+            handle.finish_piece(piece)
+        await asyncio.wait_for(stream, 1)
+        return chunks
+
+    chunks = asyncio.run(main())
+
+    assert b"".join(chunks) == b"".join(piece_bytes(p) for p in range(4))[4:-4]
+    assert backend._piece_waiters == {}
+
+
+def test_read_range_stops_on_timeout_and_cleans_up(monkeypatch):
+    monkeypatch.setattr(memory_stream, "PIECE_TIMEOUT", 0.01)
+    handle = FakeHandle(num_pieces=4, have={0})
+    reader = memory_stream.MemoryStreamReader(handle, 0)
+
+    async def main():
+        chunks = [chunk async for chunk in reader.read_range(0, 4 * PIECE_LENGTH - 1)]
+        # Let cancelled prefetch waits unwind
+        await asyncio.sleep(0.05)
+        return chunks
+
+    chunks = asyncio.run(main())
+
+    assert chunks == [piece_bytes(0)]
+    assert backend._piece_waiters == {}
+
+
+def test_read_range_slides_priority_window(monkeypatch):
+    monkeypatch.setattr(memory_stream, "PREFETCH_DEPTH", 2)
+    monkeypatch.setattr(memory_stream, "PRIORITY_WINDOW", 4)
+    num_pieces = 12
+    handle = FakeHandle(num_pieces=num_pieces, have=set(range(num_pieces)))
+    reader = memory_stream.MemoryStreamReader(handle, 0)
+
+    async def main():
+        stream = reader.read_range(0, num_pieces * PIECE_LENGTH - 1)
+        await stream.__anext__()
+        # Only the window ahead of the stream is at top priority
+        assert handle.priorities.count(7) <= 4 + 2 + 1
+        assert handle.priorities[-1] == 4
+        return [chunk async for chunk in stream]
+
+    asyncio.run(main())
+
+    # Windows are set as (piece, priority) pairs, in order, covering the range
+    pieces = [piece for call in handle.prioritize_calls for piece, _ in call]
+    assert pieces == list(range(num_pieces))
+    assert handle.prioritize_calls[0] == [(p, 7) for p in range(4)]
+
+
+@pytest.mark.parametrize("has_deadline", [True, False])
+def test_read_range_sets_deadlines_only_when_supported(monkeypatch, has_deadline):
+    monkeypatch.setattr(memory_stream, "_HAS_DEADLINE", has_deadline)
+    handle = FakeHandle(num_pieces=4, have=set(range(4)))
+    reader = memory_stream.MemoryStreamReader(handle, 0)
+
+    async def main():
+        return [chunk async for chunk in reader.read_range(0, 4 * PIECE_LENGTH - 1)]
+
+    asyncio.run(main())
+
+    assert bool(handle.deadlines) == has_deadline